@@ -1,4 +1,8 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+import copy
+import hashlib
+import importlib.util
+import json
 import streamlit as st
 import pandas as pd
 
@@ -14,6 +18,13 @@ st.set_page_config(
 if "cut_schedule" not in st.session_state:
     st.session_state.cut_schedule = defaultdict(int)
 
+if "estimate_key" not in st.session_state:
+    st.session_state.estimate_key = None
+
+# Greedy estimates of a growing cut schedule continue from the previous one
+if "estimator" not in st.session_state:
+    st.session_state.estimator = Estimator(aggregate_log=True)
+
 
 def clear_cache():
     """Helper function to clear cut schedule."""
@@ -21,6 +32,66 @@ def clear_cache():
     st.session_state.cut_schedule.clear()
 
 
+def get_estimate_key(cut_schedule: dict, wclengths: list, engine_mode: str) -> str:
+    """Returns a fingerprint of the normalized cut schedule, stock lengths and engine."""
+
+    normalized = {
+        "cut_schedule": sorted(
+            (round(float(length), 3), qty) for length, qty in cut_schedule.items() if qty > 0
+        ),
+        "wclengths": sorted(float(length) for length in wclengths),
+        "engine": engine_mode,
+    }
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+@st.cache_data(max_entries=32, show_spinner="Estimating...")
+def get_cached_estimate(estimate_key: str, _cut_schedule: list, _wclengths: list, _engine_mode: str):
+    """
+    Helper function to run the selected engine, cached by **estimate_key** only.
+    Streamlit does not hash arguments starting with an underscore.
+
+    """
+
+    match _engine_mode:
+        case "best_fit":
+            from rebarpack import get_best_fit_estimate
+            return get_best_fit_estimate(cut_schedule=_cut_schedule, wclengths=_wclengths)
+        case "exact":
+            from rebaropt import get_exact_estimate
+            return get_exact_estimate(cut_schedule=_cut_schedule, wclengths=_wclengths)
+        case "local_search":
+            from rebarsearch import get_local_search_estimate
+            return get_local_search_estimate(
+                cut_schedule=_cut_schedule, wclengths=_wclengths, time_limit=3.0
+            )
+
+
+def get_session_estimate(estimate_key: str, cut_schedule: list, wclengths: list, maxsize: int = 8):
+    """
+    Helper function to run the greedy engine on this session's estimator, which
+    continues from its previous estimate. The last **maxsize** results are kept in
+    session state by **estimate_key**, so switching back to an earlier schedule or
+    stock length selection does not estimate it again.
+
+    """
+
+    greedy_results = st.session_state.setdefault("greedy_results", OrderedDict())
+    if estimate_key in greedy_results:
+        greedy_results.move_to_end(estimate_key)
+        return greedy_results[estimate_key]
+
+    # The estimator reuses its result objects, so keep a copy of each result
+    result = copy.deepcopy(
+        st.session_state.estimator.update_estimate(cut_schedule=cut_schedule, wclengths=wclengths)
+    )
+    greedy_results[estimate_key] = result
+    if len(greedy_results) > maxsize:
+        greedy_results.popitem(last=False)
+
+    return result
+
+
 st.title("QCKRebar")
 header_container = st.container(border=True)
 header_container.write("Web application for optimized estimation of steel reinforcing bars.")
@@ -69,8 +140,25 @@ select_unit_system = cin_col2.radio(
     horizontal=True
 )
 
+engine_options = {
+    "Greedy (fast)": "greedy",
+    "Best fit (mixed cuts)": "best_fit",
+    "Exact (cutting patterns)": "exact",
+    "Local search (3 s)": "local_search",
+}
+# The exact engine needs scipy, which only the `computation` extra installs
+if importlib.util.find_spec("scipy") is None:
+    del engine_options["Exact (cutting patterns)"]
+select_engine = cin_col2.radio(
+    "**Estimate Engine**",
+    tuple(engine_options.keys()),
+    key="option_engine",
+    horizontal=True
+)
+
 length_option_mode = length_options[select_length_settings]
 unit_system_mode = unit_system_options[select_unit_system]
+engine_mode = engine_options[select_engine]
 
 match unit_system_mode:
     case "metric":
@@ -122,13 +210,32 @@ columns_log = ["produced_length",
                    "from_length",
                    "from_length_type"]
 
-if st.session_state.cut_schedule and wclengths and start_estimate:
-    result = get_estimate(cut_schedule=wcut_schedule, wclengths=wclengths)
+# Keep showing the last estimate on reruns while its inputs are unchanged
+estimate_key = None
+if st.session_state.cut_schedule and wclengths:
+    estimate_key = get_estimate_key(st.session_state.cut_schedule, wclengths, engine_mode)
+    if start_estimate:
+        st.session_state.estimate_key = estimate_key
+
+if estimate_key is not None and st.session_state.estimate_key == estimate_key:
+    if engine_mode == "greedy":
+        result = get_session_estimate(estimate_key, list(wcut_schedule), list(wclengths))
+    else:
+        result = get_cached_estimate(estimate_key, list(wcut_schedule), list(wclengths), engine_mode)
     
     # Display estimate result
     disp_estimate_result = pd.DataFrame(sorted(result[0].items()), columns=columns_estimate)
+    gap = get_estimate_gap(result, list(wcut_schedule), wclengths)
     with disp_result:
         st.dataframe(disp_estimate_result, use_container_width=True)
+        if gap["optimal"]:
+            st.caption("Total length meets the lower bound, no engine can use less steel.")
+        else:
+            st.caption(
+                f"Total length {gap['steel']} {disp_unit} is {gap['steel_gap']:.1%} above "
+                f"the lower bound of {gap['steel_lower_bound']} {disp_unit} "
+                f"(at least {gap['bars_lower_bound']} bars)."
+            )
 
     # Display unused excess lengths from estimate
     disp_excess_inventory = pd.DataFrame(result[1].items(), columns=columns_excess)
@@ -136,7 +243,7 @@ if st.session_state.cut_schedule and wclengths and start_estimate:
         st.dataframe(disp_excess_inventory, use_container_width=True)
 
     # Display cutting process log
-    disp_cut_record = pd.DataFrame(result[2])
+    disp_cut_record = result[2].to_pandas()
     with disp_log:
         st.dataframe(disp_cut_record, use_container_width=True)
 else:
@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rebarcalc import clengths_english, clengths_metric, get_estimate
+
+
+unit_systems = {
+    "metric": {"wclengths": clengths_metric, "cut_range": (0.3, 6.0), "step": 0.05},
+    "english": {"wclengths": clengths_english, "cut_range": (1.0, 20.0), "step": 0.25},
+}
+"""Stock lengths and cut length range (in m or ft) of each unit system"""
+
+
+def generate_schedule(
+    pieces: int,
+    unit_system: str = "metric",
+    distinct: int = None,
+    skew: float = 1.1,
+    seed: int = 0,
+) -> dict:
+    """
+    Returns a synthetic cut schedule with **pieces** pieces in total.
+
+    Cut lengths are drawn on a grid of the unit system's typical range. Quantities
+    follow a Zipf-like distribution with exponent **skew** over the bar marks, so a
+    few cut lengths take most of the pieces as in real member schedules.
+
+    Args:
+        pieces (int): Total quantity of all cut lengths.
+        unit_system (str): **metric** or **english**.
+        distinct (int): Number of distinct cut lengths. Default is min(pieces, 200).
+        skew (float): Exponent of the bar mark distribution, 0 for uniform.
+        seed (int): Seed of the random generator.
+
+    """
+
+    rng = np.random.default_rng(seed)
+    low, high = unit_systems[unit_system]["cut_range"]
+    step = unit_systems[unit_system]["step"]
+
+    grid = np.round(np.arange(low, high + step / 2, step), 3)
+    distinct = min(distinct or min(pieces, 200), len(grid))
+    cut_lengths = rng.choice(grid, size=distinct, replace=False)
+
+    weights = 1.0 / np.arange(1, distinct + 1) ** skew
+    quantities = rng.multinomial(pieces, weights / weights.sum())
+
+    return {
+        float(cut_length): int(quantity)
+        for cut_length, quantity in zip(cut_lengths, quantities)
+        if quantity > 0
+    }
+
+
+def get_engines(names: list, time_limit: float) -> dict:
+    """Returns the estimate function of each engine name, importing optional engines on demand."""
+
+    engines = {}
+    for name in names:
+        match name:
+            case "greedy":
+                engines[name] = get_estimate
+            case "greedy_fixed":
+                engines[name] = lambda schedule, wclengths: get_estimate(
+                    schedule, wclengths, fixed_point=True
+                )
+            case "best_fit":
+                from rebarpack import get_best_fit_estimate
+
+                engines[name] = get_best_fit_estimate
+            case "exact":
+                from rebaropt import get_exact_estimate
+
+                engines[name] = lambda schedule, wclengths: get_exact_estimate(
+                    schedule, wclengths, time_limit=time_limit
+                )
+            case "local_search":
+                from rebarsearch import get_local_search_estimate
+
+                engines[name] = lambda schedule, wclengths: get_local_search_estimate(
+                    schedule, wclengths, time_limit=time_limit
+                )
+            case _:
+                raise ValueError(f"Unknown engine: {name}")
+
+    return engines
+
+
+def measure(engine, cut_schedule: dict, wclengths: list, memory: bool = True) -> dict:
+    """Runs **engine** once for wall time, then once more under tracemalloc for peak memory."""
+
+    start = time.perf_counter()
+    result = engine(list(cut_schedule.items()), wclengths)
+    wall_time = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        engine(list(cut_schedule.items()), wclengths)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    demand = sum(length * qty for length, qty in cut_schedule.items())
+    steel = sum(length * qty for length, qty in result[0].items())
+
+    return {
+        "wall_time_s": round(wall_time, 6),
+        "peak_memory_bytes": peak_memory,
+        "bars": int(sum(result[0].values())),
+        "total_steel": round(steel, 3),
+        "waste": round(steel - demand, 3),
+        "waste_pct": round(100 * (steel - demand) / steel, 3) if steel else 0.0,
+        "excess_lengths": len(result[1]),
+        "log_records": len(result[2]),
+    }
+
+
+def run_benchmarks(
+    sizes: list,
+    unit_systems_used: list,
+    engines: dict,
+    skew: float,
+    distinct: int,
+    seed: int,
+    memory: bool,
+    max_pieces: dict,
+) -> list:
+    """Returns one benchmark record per schedule size, unit system and engine."""
+
+    records = []
+    for unit_system in unit_systems_used:
+        wclengths = unit_systems[unit_system]["wclengths"]
+        for pieces in sizes:
+            cut_schedule = generate_schedule(pieces, unit_system, distinct, skew, seed)
+            demand = sum(length * qty for length, qty in cut_schedule.items())
+
+            for name, engine in engines.items():
+                record = {
+                    "engine": name,
+                    "unit_system": unit_system,
+                    "pieces": pieces,
+                    "distinct_lengths": len(cut_schedule),
+                    "demand": round(demand, 3),
+                }
+                if pieces > max_pieces.get(name, pieces):
+                    record["skipped"] = True
+                else:
+                    record.update(measure(engine, cut_schedule, wclengths, memory))
+                records.append(record)
+                print(json.dumps(record), file=sys.stderr)
+
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rebar estimate engines.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1_000, 10_000, 100_000, 1_000_000],
+        help="total pieces of each synthetic schedule",
+    )
+    parser.add_argument(
+        "--units", nargs="+", default=["metric", "english"], choices=tuple(unit_systems)
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=["greedy", "greedy_fixed", "best_fit", "exact"],
+        help="greedy, greedy_fixed, best_fit, exact and/or local_search",
+    )
+    parser.add_argument("--distinct", type=int, default=None, help="distinct cut lengths")
+    parser.add_argument("--skew", type=float, default=1.1, help="bar mark distribution exponent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--time-limit", type=float, default=10.0, help="time limit of exact and local_search"
+    )
+    parser.add_argument(
+        "--max-best-fit-pieces",
+        type=int,
+        default=1_000_000,
+        help="skip best_fit above this many pieces",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory runs")
+    parser.add_argument("-o", "--output", help="JSON file to write, default is stdout")
+    args = parser.parse_args()
+
+    engines = get_engines(args.engines, args.time_limit)
+    records = run_benchmarks(
+        sizes=args.sizes,
+        unit_systems_used=args.units,
+        engines=engines,
+        skew=args.skew,
+        distinct=args.distinct,
+        seed=args.seed,
+        memory=not args.no_memory,
+        max_pieces={"best_fit": args.max_best_fit_pieces},
+    )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "settings": {
+            "skew": args.skew,
+            "distinct": args.distinct,
+            "seed": args.seed,
+            "time_limit": args.time_limit,
+        },
+        "results": records,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report_out:
+            json.dump(report, report_out, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from collections import defaultdict
 import math
+import sys
+import time
 
 
 clengths_metric = (6, 7.5, 9, 10.5, 12)
@@ -8,192 +12,1283 @@ clengths_metric = (6, 7.5, 9, 10.5, 12)
 clengths_english = (20, 25, 30, 35, 40)
 """Standard rebar commercial lengths in feet: 20, 25, 30, 35, 40"""
 
+NUMPY_MIN_CUT_LENGTHS = 1000
+"""Fewest distinct cut lengths for which `Estimator` imports NumPy to pick commercial lengths"""
 
-estimate_result = defaultdict(int)
-excess_inventory = defaultdict(int)
-cut_record = []
+LENGTH_SCALE = 1000
+"""Fixed-point units per length unit: millimetres per meter or 1/1000 ft per foot"""
 
+STEEL_DENSITY = 7850
+"""Density of rebar steel in kg/m^3"""
+
+rebar_weights_english = {
+    3: 0.376,
+    4: 0.668,
+    5: 1.043,
+    6: 1.502,
+    7: 2.044,
+    8: 2.670,
+    9: 3.400,
+    10: 4.303,
+    11: 5.313,
+    14: 7.650,
+    18: 13.600,
+}
+"""Nominal unit weights in lb/ft of standard rebar sizes by bar number (ASTM A615)"""
+
+
+def to_fixed_length(length: float) -> int:
+    """Converts a length into integer fixed-point units of **LENGTH_SCALE**."""
+
+    return round(length * LENGTH_SCALE)
+
+
+def from_fixed_length(length: int) -> float:
+    """Converts a length from integer fixed-point units back into m or ft."""
+
+    return length / LENGTH_SCALE
+
+
+def _round_length(length: float) -> float:
+    """Rounds a float length to the precision used by the estimate (3 decimal places)."""
+
+    return round(length, 3)
+
+
+def get_optimal_clength(cut_length: float, clengths: list = clengths_metric) -> float:
+    """
+    Returns optimal commercial length based on produced waste/residue of cut length,
+    among the commercial lengths that fit it. Raises **ValueError** if the cut length
+    is not positive or no commercial length fits it.
 
-def record_cut(length_produced:float, 
-               qty_produced:int, 
-               type_produced:str,
-               wlength:float, 
-               type_wlength:str, 
-               get_log:bool=False
-               ) -> list:
-    
     """
-    Helper function to save record of produced cut and excess.
+
+    if not cut_length > 0:
+        raise ValueError("Cut length must be positive")
+
+    residues = [
+        (round(clength % cut_length, 3), clength)
+        for clength in clengths
+        if clength >= cut_length
+    ]
+    if not residues:
+        raise ValueError("Cut length is longer than all commercial lengths")
+
+    return min(residues)[1]
+
+
+def get_optimal_clengths(cut_lengths: list, clengths: list = clengths_metric) -> tuple:
+    """
+    Vectorized version of `get_optimal_clength` for a whole cut schedule, raising
+    **ValueError** in the same cases.
 
     Args:
-        length_produced (float): Length of produced cut of rebar.
-        qty_produced (int): Quantity of produced cut of rebar.
-        clength (float): Length used to produce **cut_length** (from commercial length or excess).
-        type (str): Type of produced cut.
-        get_log (bool): Default is **False**. Returns the updated log of cut if **True**.
-    
+        cut_lengths (list): Cut lengths of the schedule.
+        clengths (list): Commercial lengths to choose from.
+
     Returns:
-        cut_record (list): A list of dict where each dict corresponds to a recorded cut.
-        **get_log** must be **True** for the function to return this list.
-    
+        optimal_clengths (ndarray): Optimal commercial length for each cut length.
+        yield_qtys (ndarray): Quantity of cut length produced per optimal commercial length.
+        residues (ndarray): Residue left per optimal commercial length.
+
     """
 
-    record = {
-        "produced_length": length_produced,
-        "produced_qty": qty_produced,
-        "produced_type": type_produced,
-        "from_length": wlength,
-        "from_length_type": type_wlength,
-    }
-    
-    cut_record.append(record)
+    import numpy as np
 
-    return cut_record if get_log else None
+    cut_lengths = np.asarray(cut_lengths)
+    clengths = np.sort(np.asarray(clengths))
 
+    if np.any(~(cut_lengths > 0)):
+        raise ValueError("Cut length must be positive")
+    if len(cut_lengths) and (not len(clengths) or cut_lengths.max() > clengths[-1]):
+        raise ValueError("Cut length is longer than all commercial lengths")
 
-def get_optimal_clength(cut_length:float, clengths:list=clengths_metric) -> float:
-    """Returns optimal commercial length based on produced waste/residue of cut length."""
+    # Ties on residue go to the shortest commercial length, same as `get_optimal_clength`
+    residues = np.round(np.mod(clengths, cut_lengths[:, np.newaxis]), 3)
+    # Commercial lengths shorter than the cut length never win, any residue is smaller
+    residues = np.where(clengths < cut_lengths[:, np.newaxis], clengths[-1] + 1, residues)
+    optimal_clengths = clengths[np.argmin(residues, axis=1)]
 
-    residues = [(round(clength % cut_length, 3), clength) for clength in clengths]
-    return min(residues)[1]
+    yield_qtys = (optimal_clengths // cut_lengths).astype(np.int64)
+    residues = np.round(optimal_clengths - cut_lengths * yield_qtys, 3)
 
+    return optimal_clengths, yield_qtys, residues
+
+
+def validate_cut_schedule(cut_schedule: list):
+    """Raises **ValueError** if cut_schedule contains invalid values."""
+
+    for cut_length, quantity in cut_schedule:
+        if not isinstance(cut_length, (float, int)):
+            raise ValueError("Invalid value found")
+        if not isinstance(quantity, (float, int)):
+            raise ValueError("Invalid input value found")
+
+
+def prepare_cut_schedule(cut_schedule: list, wclengths: list) -> tuple:
+    """
+    Returns the cut schedule and commercial lengths in fixed-point units,
+    merging repeated cut lengths and dropping zero quantities.
+
+    Returns:
+        cut_lengths (list): Distinct cut lengths, largest first.
+        quantities (list): Required quantity of each cut length.
+        stock_lengths (list): Distinct commercial lengths, shortest first.
 
-def estimate_clength(
-        cut_length:float, 
-        reqd_qty:int, 
-        wclength:float, 
-        ) -> int:
-    
     """
-    Returns the quantity of the chosen rebar commercial length 
-    based on the required quantity of cut length.
+
+    cut_schedule = list(cut_schedule)
+    validate_cut_schedule(cut_schedule)
+
+    demand = defaultdict(int)
+    for cut_length, quantity in cut_schedule:
+        if quantity > 0:
+            demand[to_fixed_length(cut_length)] += int(quantity)
+
+    cut_lengths = sorted(demand, reverse=True)
+    quantities = [demand[cut_length] for cut_length in cut_lengths]
+    stock_lengths = sorted({to_fixed_length(clength) for clength in wclengths})
+
+    if cut_lengths and (not stock_lengths or cut_lengths[0] > stock_lengths[-1]):
+        raise ValueError("Cut length is longer than all commercial lengths")
+
+    return cut_lengths, quantities, stock_lengths
+
+
+def get_lower_bounds(cut_schedule: list, wclengths: list = clengths_metric) -> dict:
+    """
+    Returns lower bounds on the commercial bars and the total commercial length that
+    any estimate of **cut_schedule** needs, without excess lengths from earlier jobs.
+    Takes O(n log n) time in the number of distinct cut lengths.
+
+    **bars** is the Martello-Toth L2 bound of packing the pieces into bars of the
+    longest commercial length, which is at least the total cut length over the
+    longest commercial length. **steel** is the total cut length, raised by the
+    pieces longer than half the longest commercial length: no two of them fit in
+    one bar, so each takes at least the shortest commercial length that holds it,
+    and only the room left in those bars can hold the shorter pieces.
+
+    """
+
+    validate_cut_schedule(cut_schedule)
+
+    demand = defaultdict(int)
+    for cut_length, quantity in cut_schedule:
+        if quantity > 0:
+            demand[to_fixed_length(cut_length)] += quantity
+
+    stock_lengths = sorted({to_fixed_length(clength) for clength in wclengths})
+    if not demand:
+        return {"bars": 0, "steel": 0.0}
+    if not stock_lengths or max(demand) > stock_lengths[-1]:
+        raise ValueError("Cut length is longer than all commercial lengths")
+
+    # Prefix counts and lengths of the pieces, shortest first
+    lengths = sorted(demand)
+    total_qty = [0]
+    total_length = [0]
+    for length in lengths:
+        total_qty.append(total_qty[-1] + demand[length])
+        total_length.append(total_length[-1] + length * demand[length])
+
+    def pieces_between(low: int, high: int) -> tuple:
+        """Returns the quantity and total length of pieces with low <= length <= high."""
+
+        start = bisect_left(lengths, low)
+        end = bisect_right(lengths, high)
+        return total_qty[end] - total_qty[start], total_length[end] - total_length[start]
+
+    capacity = stock_lengths[-1]
+    half = capacity // 2
+
+    bars = math.ceil(total_length[-1] / capacity)
+    for k in [0, *(length for length in lengths if length <= half)]:
+        qty_long, _ = pieces_between(capacity - k + 1, capacity)
+        qty_mid, length_mid = pieces_between(half + 1, capacity - k)
+        _, length_short = pieces_between(k, half)
+        room_mid = qty_mid * capacity - length_mid
+        bars = max(
+            bars,
+            qty_long + qty_mid + max(0, math.ceil((length_short - room_mid) / capacity)),
+        )
+
+    steel_long = 0
+    room_long = 0
+    for length in lengths[bisect_right(lengths, half) :]:
+        stock_length = stock_lengths[bisect_left(stock_lengths, length)]
+        steel_long += stock_length * demand[length]
+        room_long += (stock_length - length) * demand[length]
+    _, length_short = pieces_between(0, half)
+    steel = steel_long + max(0, length_short - room_long)
+
+    return {"bars": math.ceil(bars), "steel": from_fixed_length(steel)}
+
+
+def get_estimate_gap(
+    result: tuple, cut_schedule: list, wclengths: list = clengths_metric
+) -> dict:
+    """
+    Compares an estimate with the lower bounds of `get_lower_bounds`.
 
     Args:
-        cut_length (float): Length of rebar to produce.
-        reqd_qty (int): Quantity of **cut_length** to produce.
-        wclength (float): Length of rebar to use. Must be from commercial length.
+        result (tuple): Output of `get_estimate` or another engine for **cut_schedule**.
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths used.
 
     Returns:
-        reqd_qty_wclength (int): Quantity of **wclength** needed.
-    
+        gap (dict): **bars** and **steel** used by the estimate, their lower bounds,
+        the relative gaps to the bounds, and **optimal** if the total commercial
+        length meets its bound, so no other engine can do better.
+
     """
 
-    yield_qty = int(wclength // cut_length)
-    reqd_qty_wclength = math.ceil(reqd_qty / yield_qty)
-    record_cut(cut_length, reqd_qty, "cut length", wclength, "new rebar")
+    bounds = get_lower_bounds(cut_schedule, wclengths)
+    bars = sum(result[0].values())
+    steel = _round_length(sum(length * qty for length, qty in result[0].items()))
 
-    yield_waste = round(wclength - cut_length * yield_qty, 3)
-    yield_waste_qty = reqd_qty // yield_qty
+    return {
+        "bars": bars,
+        "bars_lower_bound": bounds["bars"],
+        "bars_gap": (bars - bounds["bars"]) / bounds["bars"] if bounds["bars"] else 0.0,
+        "steel": steel,
+        "steel_lower_bound": bounds["steel"],
+        "steel_gap": (steel - bounds["steel"]) / bounds["steel"] if bounds["steel"] else 0.0,
+        "optimal": steel <= bounds["steel"],
+    }
 
-    if yield_waste > 0 and yield_waste_qty > 0:
-        excess_inventory[yield_waste] += yield_waste_qty
-        record_cut(yield_waste, yield_waste_qty, "excess", wclength, "new rebar")
 
-    if (reqd_qty / yield_qty) < reqd_qty_wclength:
-        total_length = wclength * reqd_qty_wclength
-        total_reqd = cut_length * reqd_qty
-        waste_from_cut = yield_waste * yield_waste_qty
+class ExcessInventory(dict):
+    """
+    Quantity of each excess length, with the lengths also kept in a sorted index.
 
-        waste_leftover = round(total_length - total_reqd - waste_from_cut, 3)
-        excess_inventory[waste_leftover] += 1
-        record_cut(waste_leftover, 1, "excess", wclength, "new rebar")
+    Behaves like `defaultdict(int)` for reads and updates. The sorted index is
+    maintained with `bisect` on insertion and removal, so finding excess lengths
+    that fit a cut length does not require sorting the whole inventory.
 
-    return reqd_qty_wclength
+    """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._lengths = []
+        self.update(*args, **kwargs)
+
+    def __missing__(self, length: float) -> int:
+        return 0
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __setitem__(self, length: float, qty: int):
+        if length not in self:
+            insort(self._lengths, length)
+        super().__setitem__(length, qty)
+
+    def __delitem__(self, length: float):
+        super().__delitem__(length)
+        del self._lengths[bisect_left(self._lengths, length)]
+
+    def pop(self, length: float, *default) -> int:
+        if length not in self:
+            return super().pop(length, *default)
+        qty = self[length]
+        del self[length]
+        return qty
+
+    def popitem(self) -> tuple:
+        length, qty = super().popitem()
+        del self._lengths[bisect_left(self._lengths, length)]
+        return length, qty
+
+    def setdefault(self, length: float, default: int = 0) -> int:
+        if length not in self:
+            self[length] = default
+        return self[length]
+
+    def clear(self):
+        super().clear()
+        self._lengths.clear()
+
+    def update(self, *args, **kwargs):
+        for length, qty in dict(*args, **kwargs).items():
+            self[length] = qty
+
+    def lengths(self) -> list:
+        """Returns the excess lengths in ascending order."""
+
+        return list(self._lengths)
+
+    def find_longest(self, min_length: float, max_length: float = math.inf):
+        """
+        Returns the longest excess length that is at least **min_length** and
+        shorter than **max_length**, or **None** if there is no such length.
+
+        """
+
+        index = bisect_left(self._lengths, max_length) - 1
+        if index < 0 or self._lengths[index] < min_length:
+            return None
+        return self._lengths[index]
+
+
+class CutRecord:
+    """
+    Columnar log of produced cuts and excess.
+
+    Each column is kept in a typed `array.array` instead of one dict per record.
+    Produced and source length types are stored as small integer codes into
+    **produced_types** and **from_length_types**. Iterating or indexing the log
+    returns records as dict, the same shape `record_cut` used to append.
+
+    Args:
+        aggregate (bool): If **True**, records of the same operation, i.e. the same
+            produced length and type from the same source length and type, are kept
+            as one record whose quantity is the sum of theirs, so the log grows with
+            distinct operations instead of events.
+
+    """
+
+    columns = (
+        "produced_length",
+        "produced_qty",
+        "produced_type",
+        "from_length",
+        "from_length_type",
+    )
+    _typecodes = ("d", "q", "B", "d", "B")
+
+    def __init__(self, aggregate: bool = False):
+        self.produced_types = ["cut length", "excess"]
+        self.from_length_types = ["new rebar", "excess rebar"]
+        self.aggregate = aggregate
+        self._init_columns()
+
+    def _init_columns(self):
+        self._data = {
+            column: array(typecode)
+            for column, typecode in zip(self.columns, self._typecodes)
+        }
+        # Row of each operation, used only when aggregating
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return len(self._data["produced_qty"])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> dict:
+        data = self._data
+        return {
+            "produced_length": data["produced_length"][index],
+            "produced_qty": data["produced_qty"][index],
+            "produced_type": self.produced_types[data["produced_type"][index]],
+            "from_length": data["from_length"][index],
+            "from_length_type": self.from_length_types[data["from_length_type"][index]],
+        }
+
+    def __repr__(self) -> str:
+        return f"CutRecord({len(self)} records)"
+
+    @staticmethod
+    def _get_code(categories: list, value: str) -> int:
+        """Returns the code of a type, adding it to **categories** if new."""
+
+        try:
+            return categories.index(value)
+        except ValueError:
+            categories.append(value)
+            return len(categories) - 1
+
+    def append(
+        self,
+        length_produced: float,
+        qty_produced: int,
+        type_produced: str,
+        wlength: float,
+        type_wlength: str,
+    ):
+        """Appends a record of produced cut or excess. Takes the same arguments as `record_cut`."""
+
+        if self.aggregate:
+            operation = (length_produced, type_produced, wlength, type_wlength)
+            row = self._rows.get(operation)
+            if row is not None:
+                # Updating in place never resizes, so views from `to_numpy` see it
+                self._data["produced_qty"][row] += int(qty_produced)
+                return
+            self._rows[operation] = len(self)
+
+        try:
+            self._append(
+                length_produced, qty_produced, type_produced, wlength, type_wlength
+            )
+        except BufferError:
+            # Views from `to_numpy` lock the arrays, so continue on copies of them
+            size = len(self)
+            self._data = {
+                column: values[:size] for column, values in self._data.items()
+            }
+            self._append(
+                length_produced, qty_produced, type_produced, wlength, type_wlength
+            )
+
+    def _append(
+        self,
+        length_produced: float,
+        qty_produced: int,
+        type_produced: str,
+        wlength: float,
+        type_wlength: str,
+    ):
+        data = self._data
+        data["produced_length"].append(length_produced)
+        data["produced_qty"].append(int(qty_produced))
+        data["produced_type"].append(self._get_code(self.produced_types, type_produced))
+        data["from_length"].append(wlength)
+        data["from_length_type"].append(
+            self._get_code(self.from_length_types, type_wlength)
+        )
+
+    def clear(self):
+        """Removes all records. Views returned before clearing keep the old data."""
+
+        self._init_columns()
+
+    def map_lengths(self, func):
+        """Replaces every produced and source length with **func** (length)."""
+
+        for column in ("produced_length", "from_length"):
+            self._data[column] = array("d", map(func, self._data[column]))
+
+        if self.aggregate:
+            self._rows = {}
+            for row, record in enumerate(self):
+                operation = (
+                    record["produced_length"],
+                    record["produced_type"],
+                    record["from_length"],
+                    record["from_length_type"],
+                )
+                self._rows.setdefault(operation, row)
+
+    def to_numpy(self) -> dict:
+        """
+        Returns each column as a NumPy array viewing the log's memory (no copy).
+        The type columns hold integer codes.
+
+        Appending to the log while these views are alive first copies its columns,
+        since the shared arrays cannot be resized, so the views keep their data.
+
+        """
+
+        import numpy as np
+
+        return {
+            column: np.frombuffer(values, dtype=values.typecode)
+            for column, values in self._data.items()
+        }
+
+    def to_pandas(self):
+        """
+        Returns the log as a pandas DataFrame built on `to_numpy` views, with the
+        type columns as categoricals. See `to_numpy` for appending afterwards.
+
+        """
+
+        import pandas as pd
+
+        data = self.to_numpy()
+        data["produced_type"] = pd.Categorical.from_codes(
+            data["produced_type"], categories=self.produced_types
+        )
+        data["from_length_type"] = pd.Categorical.from_codes(
+            data["from_length_type"], categories=self.from_length_types
+        )
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+    def to_arrow(self):
+        """
+        Returns the log as a pyarrow Table sharing memory with `to_numpy` views,
+        with the type columns dictionary-encoded. See `to_numpy` for appending afterwards.
+
+        """
+
+        import pyarrow as pa
+
+        data = self.to_numpy()
+        for column, categories in (
+            ("produced_type", self.produced_types),
+            ("from_length_type", self.from_length_types),
+        ):
+            data[column] = pa.DictionaryArray.from_arrays(
+                pa.array(data[column]), pa.array(categories, type=pa.string())
+            )
+        return pa.table([data[column] for column in self.columns], names=self.columns)
+
+
+class EstimateStats:
+    """
+    Timings and counters collected by an instrumented `Estimator` for one estimate.
+
+    Attributes:
+        times (dict): Seconds spent in each phase. Phases are nested, e.g. the time
+            of **estimate_clength** includes its calls to **record_cut**.
+        calls (dict): Number of calls of each phase.
+        offcut_hits (int): Cut lines that were partly or fully produced from excess lengths.
+        offcut_misses (int): Cut lines that could not use any excess length.
+        pieces_from_excess (int): Quantity of cut lengths produced from excess lengths.
+        inventory_high_water (int): Largest number of distinct excess lengths held at once.
+        total_time (float): Seconds spent in `Estimator.get_estimate`.
 
-def use_excess_length(
-        cut_length:float, 
-        reqd_qty:int, 
-        ) -> int:
-    
     """
-    Utilize available excess lengths to produce cut lengths.
-    Returns the adjusted required quantity of cut length to produce.
-    
+
+    phases = ("use_excess_length", "get_optimal_clengths", "estimate_clength", "record_cut")
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.phases, 0.0)
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.offcut_hits = 0
+        self.offcut_misses = 0
+        self.pieces_from_excess = 0
+        self.inventory_high_water = 0
+        self.total_time = 0.0
+
+    @property
+    def records_written(self) -> int:
+        """Number of calls of `Estimator.record_cut`."""
+
+        return self.calls["record_cut"]
+
+    def to_dict(self) -> dict:
+        """Returns the stats as a plain dict, e.g. for JSON."""
+
+        return {
+            "times": dict(self.times),
+            "calls": dict(self.calls),
+            "offcut_hits": self.offcut_hits,
+            "offcut_misses": self.offcut_misses,
+            "pieces_from_excess": self.pieces_from_excess,
+            "inventory_high_water": self.inventory_high_water,
+            "records_written": self.records_written,
+            "total_time": self.total_time,
+        }
+
+    def __repr__(self) -> str:
+        return f"EstimateStats({self.to_dict()})"
+
+
+class Estimator:
     """
+    Owns the state of a single rebar estimate.
 
-    if not excess_inventory or reqd_qty == 0:
-        return reqd_qty
+    Each instance keeps its own estimate result, excess inventory and cut record,
+    so separate instances can run estimates concurrently (e.g. from a thread pool)
+    without sharing state.
 
-    wqty = reqd_qty
-    sorted_winventory = sorted(excess_inventory.items(), reverse=True)
+    Attributes:
+        estimate_result (defaultdict): Quantity of each commercial length used.
+        excess_inventory (ExcessInventory): Quantity of each unused excess length.
+        cut_record (CutRecord): Columnar log of produced cuts and excess.
+        fixed_point (bool): If **True**, `get_estimate` converts all lengths into integer
+            units of **LENGTH_SCALE** on input and back into m or ft on output, so every
+            step in between (and every excess inventory key) is exact integer arithmetic.
+            The helper methods then take and record lengths in fixed-point units.
+        stats (EstimateStats): Timings and counters of the last estimate, or **None**
+            unless instrumentation is enabled with **instrument** or **on_stats**.
+        on_stats (callable): Called with **stats** at the end of each `get_estimate`.
+        aggregate_log (bool): If **True**, **cut_record** sums the quantities of
+            repeated operations into one record. See `CutRecord`.
+        kerf (float): Width of material lost to the saw at each cut, in m or ft.
+        min_offcut (float): Shortest excess length worth keeping, in m or ft. Shorter
+            remainders are added to **scrap_length** instead of the excess inventory.
+        scrap_length (float): Total length of remainders discarded as scrap.
 
-    for excess_length, available_excess in sorted_winventory:
-        if excess_length < cut_length:
-            continue
+    """
 
-        qty_per_excess = int(excess_length // cut_length)
-        total_available_qty = qty_per_excess * available_excess
+    def __init__(
+        self,
+        fixed_point: bool = False,
+        instrument: bool = False,
+        on_stats=None,
+        kerf: float = 0,
+        min_offcut: float = 0,
+        aggregate_log: bool = False,
+    ):
+        self.estimate_result = defaultdict(int)
+        self.excess_inventory = ExcessInventory()
+        self.cut_record = CutRecord(aggregate=aggregate_log)
+        self.fixed_point = fixed_point
+        self.on_stats = on_stats
+        self.kerf = kerf
+        self.min_offcut = min_offcut
+        self.scrap_length = 0
+        self.stats = None
 
-        # Case when chosen excess length is enough or not sufficient to produce required quantity
-        # Used all available stock of chosen excess length
-        if wqty >= total_available_qty:
-            record_cut(cut_length, total_available_qty, "cut length", excess_length, "excess rebar")
-            excess_inventory.pop(excess_length, None)
+        # Sorted lines and commercial lengths of the last estimate, for `update_estimate`
+        self._estimated_lines = None
+        self._estimated_wclengths = None
 
-            remain_excess = round(excess_length % cut_length, 3)
-            if remain_excess > 0:
-                excess_inventory[remain_excess] += available_excess
-                record_cut(remain_excess, available_excess, "excess", excess_length, "excess rebar")
+        # Integer lengths are already exact, rounding only keeps them as int
+        self._round_length = round if fixed_point else _round_length
 
-            wqty -= total_available_qty
-            
-        # Case when chosen excess length is more than sufficient to produce required quantity
-        # Used portions of available stock of chosen excess length
+        # Kerf and offcut limits in the working units of the helper methods
+        if fixed_point:
+            self._kerf = to_fixed_length(kerf)
+            self._min_offcut = to_fixed_length(min_offcut)
         else:
-            qty_used_full_excess = math.ceil(wqty / qty_per_excess)
-            qty_leftover = wqty % qty_per_excess
-            record_cut(cut_length, wqty, "cut length", excess_length, "excess rebar")
+            self._kerf = kerf
+            self._min_offcut = min_offcut
+
+        # Instrumented methods shadow the plain ones only on this instance,
+        # so estimators without instrumentation run with no overhead
+        if instrument or on_stats is not None:
+            self.stats = EstimateStats()
+            self._instrument()
+
+    def _instrument(self):
+        """Wraps the phases of the estimate to collect **stats**."""
+
+        perf_counter = time.perf_counter
+
+        def timed(phase: str, method):
+            def timed_method(*args, **kwargs):
+                start = perf_counter()
+                result = method(*args, **kwargs)
+                self.stats.times[phase] += perf_counter() - start
+                self.stats.calls[phase] += 1
+                return result
+
+            return timed_method
+
+        use_excess_length = self.use_excess_length
+        estimate_clength = self.estimate_clength
+
+        def counted_use_excess_length(cut_length: float, reqd_qty: int) -> int:
+            stats = self.stats
+            wqty = use_excess_length(cut_length, reqd_qty)
+            if wqty < reqd_qty:
+                stats.offcut_hits += 1
+                stats.pieces_from_excess += reqd_qty - wqty
+            else:
+                stats.offcut_misses += 1
+            stats.inventory_high_water = max(
+                stats.inventory_high_water, len(self.excess_inventory)
+            )
+            return wqty
+
+        def counted_estimate_clength(
+            cut_length: float, reqd_qty: int, wclength: float
+        ) -> int:
+            qty_clength = estimate_clength(cut_length, reqd_qty, wclength)
+            self.stats.inventory_high_water = max(
+                self.stats.inventory_high_water, len(self.excess_inventory)
+            )
+            return qty_clength
+
+        self.use_excess_length = timed("use_excess_length", counted_use_excess_length)
+        self.estimate_clength = timed("estimate_clength", counted_estimate_clength)
+        self.get_optimal_clengths = timed(
+            "get_optimal_clengths", self.get_optimal_clengths
+        )
+        self.record_cut = timed("record_cut", self.record_cut)
+
+    def reset(self):
+        """Clears the result, excess inventory, cut record and stats of the estimator."""
+
+        self.estimate_result.clear()
+        self.excess_inventory.clear()
+        self.cut_record.clear()
+        self.scrap_length = 0
+        self._estimated_lines = None
+        if self.stats is not None:
+            self.stats = EstimateStats()
+
+    def record_cut(
+        self,
+        length_produced: float,
+        qty_produced: int,
+        type_produced: str,
+        wlength: float,
+        type_wlength: str,
+        get_log: bool = False,
+    ) -> list:
+        """
+        Helper function to save record of produced cut and excess.
+
+        Args:
+            length_produced (float): Length of produced cut of rebar.
+            qty_produced (int): Quantity of produced cut of rebar.
+            type_produced (str): Type of produced cut of rebar (cut length/excess).
+            wlength (float): Length used to produce cut_length.
+            type_wlength (str): Type of length used to produce cut_length (from commercial length or excess).
+            get_log (bool): Default is **False**. Returns the updated log of cut if **True**.
+
+        Returns:
+            cut_record (CutRecord): Columnar log of produced cuts and excess.
+            **get_log** must be **True** for the function to return this log.
+
+        """
 
-            excess_inventory[excess_length] -= qty_used_full_excess
-            if excess_inventory[excess_length] <= 0:
+        self.cut_record.append(
+            length_produced, qty_produced, type_produced, wlength, type_wlength
+        )
+
+        return self.cut_record if get_log else None
+
+    def estimate_clength(
+        self,
+        cut_length: float,
+        reqd_qty: int,
+        wclength: float,
+    ) -> int:
+        """
+        Returns the quantity of the chosen rebar commercial length
+        based on the required quantity of cut length.
+
+        Args:
+            cut_length (float): Length of rebar to produce.
+            reqd_qty (int): Quantity of **cut_length** to produce.
+            wclength (float): Length of rebar to use. Must be from commercial length.
+
+        Returns:
+            reqd_qty_wclength (int): Quantity of **wclength** needed.
+
+        """
+
+        round_length = self._round_length
+
+        yield_qty = int(wclength // cut_length)
+        reqd_qty_wclength = math.ceil(reqd_qty / yield_qty)
+        self.record_cut(cut_length, reqd_qty, "cut length", wclength, "new rebar")
+
+        yield_waste = round_length(wclength - cut_length * yield_qty)
+        yield_waste_qty = reqd_qty // yield_qty
+
+        if yield_waste_qty > 0:
+            self.add_excess(yield_waste, yield_waste_qty, wclength, "new rebar")
+
+        if (reqd_qty / yield_qty) < reqd_qty_wclength:
+            total_length = wclength * reqd_qty_wclength
+            total_reqd = cut_length * reqd_qty
+            waste_from_cut = yield_waste * yield_waste_qty
+
+            waste_leftover = round_length(total_length - total_reqd - waste_from_cut)
+            self.add_excess(waste_leftover, 1, wclength, "new rebar")
+
+        return reqd_qty_wclength
+
+    def use_excess_length(
+        self,
+        cut_length: float,
+        reqd_qty: int,
+    ) -> int:
+        """
+        Utilize available excess lengths to produce cut lengths.
+        Returns the adjusted required quantity of cut length to produce.
+
+        """
+
+        excess_inventory = self.excess_inventory
+        record_cut = self.record_cut
+        round_length = self._round_length
+
+        if not excess_inventory or reqd_qty == 0:
+            return reqd_qty
+
+        wqty = reqd_qty
+        upper_length = math.inf
+
+        # Use excess lengths starting at the longest one that fits the cut length
+        while wqty > 0:
+            excess_length = excess_inventory.find_longest(cut_length, upper_length)
+            if excess_length is None:
+                break
+
+            upper_length = excess_length
+            available_excess = excess_inventory[excess_length]
+            qty_per_excess = int(excess_length // cut_length)
+            total_available_qty = qty_per_excess * available_excess
+
+            # Case when chosen excess length is enough or not sufficient to produce required quantity
+            # Used all available stock of chosen excess length
+            if wqty >= total_available_qty:
+                record_cut(
+                    cut_length,
+                    total_available_qty,
+                    "cut length",
+                    excess_length,
+                    "excess rebar",
+                )
                 excess_inventory.pop(excess_length, None)
 
-            # Remaining excess length from full cuts
-            remain_excess = round(excess_length % cut_length, 3)
-            if remain_excess > 0:
-                excess_inventory[remain_excess] += qty_used_full_excess
-                record_cut(remain_excess, qty_used_full_excess, "excess", excess_length, "excess rebar")
-
-            # Remaining excess length from leftover
-            if qty_leftover > 0:
-                total_length_excess = excess_length * available_excess
-                total_remain_excess = remain_excess * qty_used_full_excess
-                total_length_reqd = cut_length * wqty
-                
-                leftover_excess = round(total_length_excess - total_remain_excess - total_length_reqd, 3)
-                excess_inventory[leftover_excess] += 1
-                record_cut(leftover_excess, 1, "excess", excess_length, "excess rebar")
-
-            wqty = 0
-            
-    return wqty
-
-
-def get_estimate(cut_schedule:list, wclengths:list) -> list:
-    """Wrapper function for functions used to estimate rebars."""
-
-    # Ensures program runs at clean state
-    estimate_result.clear()
-    excess_inventory.clear()
-    cut_record.clear()
-
-    # Sort cut schedule starting at largest cut length
-    input_cut_lengths = sorted(cut_schedule, reverse=True)
-
-    # Estimate required quantity for each cut length
-    for cut_length, quantity in input_cut_lengths:
-        
-        # Use excess lengths from previous cut if applicable
-        wqty = use_excess_length(cut_length=cut_length, reqd_qty=quantity)
-        if wqty <= 0:
-            break
-        
-        # Pick optimal rebar length then use it for estimate
-        clength = get_optimal_clength(cut_length=cut_length, clengths=wclengths)
-        qty_clength = estimate_clength(cut_length=cut_length, reqd_qty=wqty, wclength=clength)
-
-        # Record result
-        estimate_result[clength] += qty_clength
-
-    return estimate_result, excess_inventory, cut_record
\ No newline at end of file
+                remain_excess = round_length(excess_length % cut_length)
+                self.add_excess(
+                    remain_excess, available_excess, excess_length, "excess rebar"
+                )
+
+                wqty -= total_available_qty
+
+            # Case when chosen excess length is more than sufficient to produce required quantity
+            # Used portions of available stock of chosen excess length
+            else:
+                qty_used_full_excess = math.ceil(wqty / qty_per_excess)
+                qty_leftover = wqty % qty_per_excess
+                record_cut(cut_length, wqty, "cut length", excess_length, "excess rebar")
+
+                excess_inventory[excess_length] -= qty_used_full_excess
+                if excess_inventory[excess_length] <= 0:
+                    excess_inventory.pop(excess_length, None)
+
+                # Remaining excess length from full cuts
+                remain_excess = round_length(excess_length % cut_length)
+                self.add_excess(
+                    remain_excess, qty_used_full_excess, excess_length, "excess rebar"
+                )
+
+                # Remaining excess length from leftover
+                if qty_leftover > 0:
+                    total_length_excess = excess_length * qty_used_full_excess
+                    total_remain_excess = remain_excess * qty_used_full_excess
+                    total_length_reqd = cut_length * wqty
+
+                    leftover_excess = round_length(
+                        total_length_excess - total_remain_excess - total_length_reqd
+                    )
+                    self.add_excess(leftover_excess, 1, excess_length, "excess rebar")
+
+                wqty = 0
+
+        return wqty
+
+    def add_excess(
+        self, excess_length: float, qty: int, wlength: float, type_wlength: str
+    ):
+        """
+        Adds a remainder to the excess inventory, or to **scrap_length** if it is
+        shorter than **min_offcut** after the last saw cut.
+
+        While **kerf** is set, lengths inside the estimate include one kerf width
+        (see `get_estimate`), so a remainder of length up to one kerf is all lost
+        to the saw.
+
+        """
+
+        length = self._round_length(excess_length - self._kerf)
+        if length <= 0:
+            return
+
+        if length < self._min_offcut:
+            self.scrap_length += length * qty
+            self.record_cut(excess_length, qty, "scrap", wlength, type_wlength)
+            return
+
+        self.excess_inventory[excess_length] += qty
+        self.record_cut(excess_length, qty, "excess", wlength, type_wlength)
+
+    def get_estimate(
+        self,
+        cut_schedule: list,
+        wclengths: list = clengths_metric,
+        excess_inventory: dict = None,
+    ) -> list:
+        """
+        Wrapper function for functions used to estimate rebars. Excess lengths in
+        **excess_inventory** (e.g. offcuts kept from earlier jobs) are available to
+        the estimate from the start, and the unused ones remain in the result.
+
+        With a **kerf**, every cut length and commercial length is lengthened by one
+        kerf width for the estimate: a bar of length L then yields n pieces of length c
+        exactly when n * (c + kerf) <= L + kerf, as the last piece needs no cut. Lengths
+        are shortened back before they are returned.
+
+        """
+
+        start = time.perf_counter()
+        validate_cut_schedule(cut_schedule)
+
+        # Ensures estimator runs at clean state
+        self.reset()
+
+        if excess_inventory:
+            self.excess_inventory.update(excess_inventory)
+            self._convert_to_working()
+
+        self._estimated_lines = sorted(cut_schedule, reverse=True)
+        self._estimated_wclengths = list(wclengths)
+        self._run_estimate(self._estimated_lines, wclengths, start)
+
+        return self.estimate_result, self.excess_inventory, self.cut_record
+
+    def update_estimate(
+        self, cut_schedule: list, wclengths: list = clengths_metric
+    ) -> list:
+        """
+        Re-estimates a changed cut schedule, reusing the previous result of
+        `get_estimate` or `update_estimate` where it is still valid.
+
+        Cut lengths are estimated longest first, so the state after each line only
+        depends on the lines before it. If the previous lines are still the longest
+        lines of **cut_schedule**, unchanged, only the new shorter lines are estimated
+        on top of the previous state. Any other change reruns `get_estimate`.
+
+        Args:
+            cut_schedule (list): Iterable of (cut_length, quantity) of the whole
+                changed cut schedule, not only the change.
+            wclengths (list): Commercial lengths to use.
+
+        """
+
+        start = time.perf_counter()
+        lines = list(cut_schedule)
+        validate_cut_schedule(lines)
+        lines.sort(reverse=True)
+
+        previous_lines = self._estimated_lines
+        if (
+            previous_lines is None
+            or list(wclengths) != self._estimated_wclengths
+            or lines[: len(previous_lines)] != previous_lines
+        ):
+            return self.get_estimate(lines, wclengths)
+
+        # Stats cover this update only, as for any other estimate
+        if self.stats is not None:
+            self.stats = EstimateStats()
+
+        self._estimated_lines = lines
+        self._convert_to_working()
+        self._run_estimate(lines[len(previous_lines) :], wclengths, start)
+
+        return self.estimate_result, self.excess_inventory, self.cut_record
+
+    def _run_estimate(self, cut_schedule: list, wclengths: list, start: float):
+        """Estimates **cut_schedule** on top of the state in working units and converts the state for output."""
+
+        # Convert lengths into fixed-point units once on input
+        if self.fixed_point:
+            cut_schedule = [
+                (to_fixed_length(cut_length), quantity)
+                for cut_length, quantity in cut_schedule
+            ]
+            wclengths = [to_fixed_length(clength) for clength in wclengths]
+
+        kerf = self._kerf
+        round_length = self._round_length
+        if kerf:
+            cut_schedule = [
+                (round_length(cut_length + kerf), quantity)
+                for cut_length, quantity in cut_schedule
+            ]
+            wclengths = [round_length(clength + kerf) for clength in wclengths]
+
+        self.estimate_cut_schedule(cut_schedule, wclengths)
+
+        if kerf:
+            self.map_lengths(lambda length: round_length(length - kerf))
+
+        if self.fixed_point:
+            self.convert_from_fixed()
+        else:
+            self.scrap_length = _round_length(self.scrap_length)
+
+        if self.stats is not None:
+            self.stats.total_time = time.perf_counter() - start
+            if self.on_stats is not None:
+                self.on_stats(self.stats)
+
+    def _convert_to_working(self):
+        """Reverses the output conversion of `_run_estimate` to continue an estimate."""
+
+        if self.fixed_point:
+            self.map_lengths(to_fixed_length)
+            self.scrap_length = to_fixed_length(self.scrap_length)
+
+        kerf = self._kerf
+        if kerf:
+            round_length = self._round_length
+            self.map_lengths(lambda length: round_length(length + kerf))
+
+    def get_optimal_clengths(self, cut_lengths: list, wclengths: list) -> list:
+        """Returns the optimal commercial length of each cut length. See `get_optimal_clengths`."""
+
+        # Importing NumPy takes longer than short schedules take in pure Python
+        if "numpy" not in sys.modules and len(cut_lengths) < NUMPY_MIN_CUT_LENGTHS:
+            wclengths = sorted(wclengths)
+            return [get_optimal_clength(cut_length, wclengths) for cut_length in cut_lengths]
+
+        return get_optimal_clengths(cut_lengths, wclengths)[0].tolist()
+
+    def estimate_cut_schedule(self, cut_schedule: list, wclengths: list):
+        """
+        Estimates a cut schedule on top of the current state of the estimator,
+        drawing on its excess inventory first.
+
+        Unlike `get_estimate`, the estimator is not reset and lengths are neither
+        validated nor converted: they must already be in fixed-point units if
+        **fixed_point** is enabled.
+
+        """
+
+        # Sort cut schedule starting at largest cut length
+        input_cut_lengths = sorted(cut_schedule, reverse=True)
+        if not input_cut_lengths:
+            return
+
+        # Pick optimal rebar length for every cut length at once
+        optimal_clengths = self.get_optimal_clengths(
+            [cut_length for cut_length, _ in input_cut_lengths], wclengths
+        )
+
+        # Estimate required quantity for each cut length
+        for (cut_length, quantity), clength in zip(input_cut_lengths, optimal_clengths):
+            # Use excess lengths from previous cut if applicable
+            wqty = self.use_excess_length(cut_length=cut_length, reqd_qty=quantity)
+            if wqty <= 0:
+                continue
+
+            # Use optimal rebar length for estimate
+            qty_clength = self.estimate_clength(
+                cut_length=cut_length, reqd_qty=wqty, wclength=clength
+            )
+
+            # Record result
+            self.estimate_result[clength] += qty_clength
+
+    def map_lengths(self, func):
+        """Replaces every length of the result, excess inventory and cut record with **func** (length)."""
+
+        for length_map in (self.estimate_result, self.excess_inventory):
+            converted = {func(length): qty for length, qty in length_map.items()}
+            length_map.clear()
+            length_map.update(converted)
+
+        self.cut_record.map_lengths(func)
+
+    def convert_from_fixed(self):
+        """Converts the lengths of the result, excess inventory, cut record and scrap back into m or ft."""
+
+        self.map_lengths(from_fixed_length)
+        self.scrap_length = from_fixed_length(self.scrap_length)
+
+
+# Module-level state and helpers are kept for existing callers; they operate on a
+# shared default estimator and are not safe to use concurrently.
+_default_estimator = Estimator()
+estimate_result = _default_estimator.estimate_result
+excess_inventory = _default_estimator.excess_inventory
+cut_record = _default_estimator.cut_record
+
+
+def estimate_clength(cut_length: float, reqd_qty: int, wclength: float) -> int:
+    """Runs `Estimator.estimate_clength` on the module-level default estimator."""
+
+    return _default_estimator.estimate_clength(cut_length, reqd_qty, wclength)
+
+
+def use_excess_length(cut_length: float, reqd_qty: int) -> int:
+    """Runs `Estimator.use_excess_length` on the module-level default estimator."""
+
+    return _default_estimator.use_excess_length(cut_length, reqd_qty)
+
+
+def record_cut(
+    length_produced: float,
+    qty_produced: int,
+    type_produced: str,
+    wlength: float,
+    type_wlength: str,
+    get_log: bool = False,
+) -> list:
+    """Runs `Estimator.record_cut` on the module-level default estimator."""
+
+    return _default_estimator.record_cut(
+        length_produced, qty_produced, type_produced, wlength, type_wlength, get_log
+    )
+
+
+def get_estimate(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    fixed_point: bool = False,
+    on_stats=None,
+    kerf: float = 0,
+    min_offcut: float = 0,
+    excess_inventory: dict = None,
+    aggregate_log: bool = False,
+) -> list:
+    """
+    Wrapper function for functions used to estimate rebars.
+
+    Each call runs on a new `Estimator`, so concurrent calls do not share state.
+    See `Estimator` for **fixed_point**, **on_stats**, **kerf**, **min_offcut**
+    and **aggregate_log**.
+    Remainders shorter than **min_offcut** are logged with the type "scrap".
+    See `Estimator.get_estimate` for **excess_inventory**.
+
+    """
+
+    estimator = Estimator(
+        fixed_point=fixed_point,
+        on_stats=on_stats,
+        kerf=kerf,
+        min_offcut=min_offcut,
+        aggregate_log=aggregate_log,
+    )
+    return estimator.get_estimate(
+        cut_schedule=cut_schedule,
+        wclengths=wclengths,
+        excess_inventory=excess_inventory,
+    )
+
+
+def get_greedy_estimate(cut_schedule: list, wclengths: list = clengths_metric) -> list:
+    """
+    Returns whichever of the fixed-point and floating point `get_estimate` uses less
+    steel, preferring the fixed-point one on ties. Rounding can make either one pick
+    other commercial lengths for the same cut schedule, so engines that fall back to
+    greedy compare against both.
+
+    """
+
+    cut_schedule = list(cut_schedule)
+    fixed_result = get_estimate(cut_schedule, wclengths, fixed_point=True)
+    float_result = get_estimate(cut_schedule, wclengths)
+
+    def get_steel(result):
+        return to_fixed_length(sum(length * qty for length, qty in result[0].items()))
+
+    if get_steel(float_result) < get_steel(fixed_result):
+        return float_result
+    return fixed_result
+
+
+def iter_estimates(
+    cut_schedules: list,
+    wclengths: list = clengths_metric,
+    workers: int = None,
+    fixed_point: bool = False,
+):
+    """
+    Estimates independent cut schedules in a process pool.
+    Yields (index, result) for each cut schedule as soon as its estimate is done.
+
+    Args:
+        cut_schedules (list): Cut schedules, each an iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths to use for every cut schedule.
+        workers (int): Number of worker processes. Default is the number of CPUs.
+            Runs in the current process if **1**.
+        fixed_point (bool): See `Estimator`.
+
+    """
+
+    # Schedules are often passed as dict views, which cannot be sent to workers
+    cut_schedules = [list(cut_schedule) for cut_schedule in cut_schedules]
+
+    if workers == 1:
+        for index, cut_schedule in enumerate(cut_schedules):
+            yield index, get_estimate(cut_schedule, wclengths, fixed_point)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(get_estimate, cut_schedule, wclengths, fixed_point): index
+            for index, cut_schedule in enumerate(cut_schedules)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def get_estimates(
+    cut_schedules: list,
+    wclengths: list = clengths_metric,
+    workers: int = None,
+    fixed_point: bool = False,
+) -> list:
+    """
+    Estimates independent cut schedules in a process pool.
+    Returns the results of `get_estimate` in the same order as **cut_schedules**.
+    See `iter_estimates` for the arguments.
+
+    """
+
+    results = [None] * len(cut_schedules)
+    for index, result in iter_estimates(cut_schedules, wclengths, workers, fixed_point):
+        results[index] = result
+
+    return results
+
+
+def get_unit_weight(bar_size: int, unit_system: str = "metric") -> float:
+    """
+    Returns the weight per length of a rebar: in kg/m for a **metric** bar diameter
+    in mm, or in lb/ft for an **english** bar number.
+
+    """
+
+    match unit_system:
+        case "metric":
+            return STEEL_DENSITY * math.pi * (bar_size / 1000) ** 2 / 4
+        case "english":
+            if bar_size not in rebar_weights_english:
+                raise ValueError(f"Unknown bar number: {bar_size}")
+            return rebar_weights_english[bar_size]
+        case _:
+            raise ValueError(f"Unknown unit system: {unit_system}")
+
+
+def get_bar_size_estimates(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    unit_system: str = "metric",
+    workers: int = None,
+    fixed_point: bool = False,
+) -> list:
+    """
+    Estimates a cut schedule of several bar sizes. Bars of different sizes are never
+    cut from one another, so each bar size is estimated on its own in a process pool.
+
+    Args:
+        cut_schedule (list): Iterable of (bar_size, cut_length, quantity), where
+            **bar_size** is the diameter in mm (metric) or the bar number (english).
+        wclengths (list): Commercial lengths to use for every bar size.
+        unit_system (str): **metric** or **english**, used for the weights.
+        workers (int): See `iter_estimates`.
+        fixed_point (bool): See `Estimator`.
+
+    Returns:
+        estimates (dict): Result of `get_estimate` for each bar size, smallest first.
+        weights (dict): Weight of the commercial lengths of each bar size, in kg or lb.
+        tonnage (float): Total weight in metric tons or short tons (2000 lb).
+
+    """
+
+    partitions = defaultdict(list)
+    for bar_size, cut_length, quantity in cut_schedule:
+        partitions[bar_size].append((cut_length, quantity))
+
+    # Unknown bar sizes fail before any estimate runs
+    bar_sizes = sorted(partitions)
+    unit_weights = {
+        bar_size: get_unit_weight(bar_size, unit_system) for bar_size in bar_sizes
+    }
+
+    results = get_estimates(
+        [partitions[bar_size] for bar_size in bar_sizes], wclengths, workers, fixed_point
+    )
+    estimates = dict(zip(bar_sizes, results))
+
+    weights = {
+        bar_size: round(
+            unit_weights[bar_size]
+            * sum(length * qty for length, qty in estimates[bar_size][0].items()),
+            3,
+        )
+        for bar_size in bar_sizes
+    }
+    weight_per_ton = 1000 if unit_system == "metric" else 2000
+    tonnage = round(sum(weights.values()) / weight_per_ton, 3)
+
+    return estimates, weights, tonnage
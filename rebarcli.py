@@ -0,0 +1,388 @@
+from collections import defaultdict
+import csv
+import os
+import sys
+
+from rebarcalc import clengths_english, clengths_metric, get_estimate
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+
+    if len(sys.argv) > 2:
+        print("Usage: <file> | <file> -i/--input | <file> batch <inputs> [options]")
+        sys.exit(1)
+    elif len(sys.argv) == 2 and sys.argv[1] not in ("-i", "--input"):
+        print("Usage: <file> | <file> -i/--input | <file> batch <inputs> [options]")
+        sys.exit(1)
+    elif len(sys.argv) == 1:
+        is_import_mode = True
+    else:
+        is_import_mode = False
+
+    wclengths = select_unit()
+    cut_schedule = get_cut_schedule(is_import_mode)
+    if not cut_schedule:
+        print("Error: Cut schedule is empty")
+        sys.exit(4)
+
+    outputs = get_estimate(cut_schedule=cut_schedule.items(), wclengths=wclengths)
+
+    print("Estimate Result")
+    for length, quantity in sorted(outputs[0].items()):
+        print(f"Length: {length}, Quantity: {quantity}")
+
+    print("Unused Lengths")
+    for length, quantity in sorted(outputs[1].items()):
+        print(f"Length: {length}, Quantity: {quantity}")
+
+    export_result(result=outputs)
+
+
+def run_batch(argv: list) -> int:
+    """
+    Non-interactive mode: estimates every cut schedule CSV file matched by the
+    input paths or glob patterns, each in its own worker process, and writes the
+    results of each file into its own folder under the output directory.
+    Returns the exit status: **1** if any file failed, else **0**.
+
+    """
+
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(
+        prog="rebarcli.py batch",
+        description="Estimate many cut schedule CSV files without prompts.",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="CSV files, directories or glob patterns (** allowed)"
+    )
+    parser.add_argument("-u", "--unit", choices=("metric", "english"), default="metric")
+    parser.add_argument(
+        "-l",
+        "--lengths",
+        type=float,
+        nargs="+",
+        help="commercial lengths to use, default is all standard lengths of the unit",
+    )
+    parser.add_argument("-o", "--output-dir", default="results")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("-f", "--format", choices=("csv", "parquet", "arrow"), default="csv")
+    args = parser.parse_args(argv)
+
+    wclengths = args.lengths or (
+        clengths_metric if args.unit == "metric" else clengths_english
+    )
+
+    filenames = []
+    for pattern in args.inputs:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.csv")
+        filenames.extend(sorted(glob.glob(pattern, recursive=True)))
+    filenames = [
+        os.path.abspath(filename)
+        for filename in dict.fromkeys(filenames)
+        if filename.lower().endswith(".csv")
+    ]
+    if not filenames:
+        print("Error: No CSV files matched the inputs")
+        return 1
+
+    # Output folders mirror the input paths below their common folder
+    common_path = os.path.commonpath([os.path.dirname(name) for name in filenames])
+    jobs = [
+        (
+            filename,
+            os.path.join(
+                args.output_dir, os.path.splitext(os.path.relpath(filename, common_path))[0]
+            ),
+        )
+        for filename in filenames
+    ]
+
+    failed = 0
+    if args.workers == 1:
+        outcomes = (_run_batch_job(job, wclengths, args.format) for job in jobs)
+        for filename, error in outcomes:
+            failed += _report_batch_job(filename, error)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(_run_batch_job, job, wclengths, args.format)
+                for job in jobs
+            ]
+            for future in as_completed(futures):
+                failed += _report_batch_job(*future.result())
+
+    print(f"Estimated {len(jobs) - failed} of {len(jobs)} cut schedules into {args.output_dir}")
+    return 1 if failed else 0
+
+
+def _run_batch_job(job: tuple, wclengths: list, file_format: str) -> tuple:
+    """Estimates one cut schedule file of `run_batch`. Returns (filename, error message or **None**)."""
+
+    filename, result_path = job
+    try:
+        cut_schedule = read_cut_schedule(filename)
+        if not cut_schedule:
+            raise ValueError("Cut schedule is empty")
+        longest = max(wclengths)
+        if any(not 0 < cut_length <= longest for cut_length in cut_schedule):
+            raise ValueError(f"Cut lengths must be positive and at most {longest}")
+        result = get_estimate(cut_schedule=cut_schedule.items(), wclengths=wclengths)
+        export_result(result, file_format=file_format, result_path=result_path)
+    except Exception as error:
+        # Any failure is reported for this file only, so the other files still run
+        return filename, str(error) or type(error).__name__
+
+    return filename, None
+
+
+def _report_batch_job(filename: str, error: str) -> int:
+    """Prints the outcome of one batch job and returns **1** if it failed."""
+
+    if error is None:
+        print(f"Done: {filename}")
+        return 0
+
+    print(f"Error: {filename}: {error}")
+    return 1
+
+
+def select_unit() -> list:
+    """Helper function for main to select unit system: Metric (in m), English (in ft)."""
+
+    while True:
+        print("Select unit system: Metric (m), English (ft)")
+        selected_unit = input("Enter (metric/english): ")
+
+        if selected_unit.lower() not in ("metric", "english"):
+            continue
+        else:
+            break
+
+    match selected_unit:
+        case "metric":
+            return clengths_metric
+        case "english":
+            return clengths_english
+
+
+def get_cut_schedule(import_mode: bool) -> dict:
+    """Returns a processed version of cut schedule in dictionary format."""
+
+    cut_schedule = defaultdict(float)
+
+    if import_mode:
+        filename = input("Import csv file: ")
+        if not os.path.exists(filename):
+            print("Error: File does not exist")
+            sys.exit(1)
+        elif not filename.lower().endswith(".csv"):
+            print("Error: Imported file not a CSV")
+            sys.exit(1)
+
+        try:
+            cut_schedule.update(read_cut_schedule(filename))
+        except ValueError:
+            print("Error: Invalid values detected")
+            sys.exit(1)
+    else:
+        print(
+            "Enter cut schedule in this format: 'cut_length:quantity' or press CTRL+Z (CTRL+D) to stop"
+        )
+        while True:
+            try:
+                data_in = input("Enter 'cut_length:quantity': ")
+                cut_length, quantity = data_in.split(":")
+                cut_schedule[float(cut_length.strip())] += float(quantity.strip())
+            except ValueError:
+                print("Error: Invalid values detected")
+                sys.exit(1)
+            except EOFError:
+                break
+
+    return dict(cut_schedule)
+
+
+def read_cut_schedule(filename: str, block_size: int = 1 << 20) -> dict:
+    """
+    Reads a cut schedule CSV file (header row, then cut_length,quantity rows) in
+    chunks of **block_size** bytes. Columns are matched by header name and other
+    columns are ignored. Quantities of repeated cut lengths are summed.
+    Raises **ValueError** if the file contains invalid or missing values or columns.
+
+    """
+
+    import pyarrow as pa
+
+    return _read_schedule_csv(filename, {"cut_length": pa.float64()}, block_size)
+
+
+def read_bar_size_schedule(filename: str, block_size: int = 1 << 20) -> dict:
+    """
+    Reads a cut schedule CSV file of several bar sizes (header row, then
+    bar_size,cut_length,quantity rows) like `read_cut_schedule`.
+    Returns the summed quantity keyed by (bar_size, cut_length).
+
+    """
+
+    import pyarrow as pa
+
+    key_types = {"bar_size": pa.int64(), "cut_length": pa.float64()}
+    return _read_schedule_csv(filename, key_types, block_size)
+
+
+def _read_schedule_csv(filename: str, key_types: dict, block_size: int) -> dict:
+    """Reads key columns and a quantity column in chunks, summing the quantity per key."""
+
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    keys = list(key_types)
+    column_names = [*keys, "quantity"]
+    # Columns are picked by header name, so extra columns such as a bar mark are ignored
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={**key_types, "quantity": pa.float64()},
+        include_columns=column_names,
+    )
+
+    cut_schedule = defaultdict(float)
+    try:
+        reader = pa_csv.open_csv(
+            filename, read_options=read_options, convert_options=convert_options
+        )
+    except KeyError as error:
+        raise ValueError(f"Missing column: {error}") from error
+
+    with reader:
+        for batch in reader:
+            if any(batch.column(name).null_count for name in column_names):
+                raise ValueError("Missing value found")
+
+            # Sum quantities per key within the chunk before merging
+            chunk = pa.Table.from_batches([batch]).group_by(keys)
+            totals = chunk.aggregate([("quantity", "sum")])
+            key_values = [totals.column(name).to_pylist() for name in keys]
+            if len(keys) == 1:
+                key_values = key_values[0]
+            else:
+                key_values = zip(*key_values)
+
+            for key, quantity in zip(key_values, totals.column("quantity_sum").to_pylist()):
+                cut_schedule[key] += quantity
+
+    return dict(cut_schedule)
+
+
+def get_result_tables(result: tuple) -> dict:
+    """Returns the estimate result, unused excess and cut log as pyarrow Tables keyed by file name."""
+
+    import pyarrow as pa
+
+    def length_table(length_map: dict, length_column: str):
+        items = sorted(length_map.items())
+        return pa.table(
+            {
+                length_column: pa.array([length for length, _ in items], pa.float64()),
+                "quantity": pa.array([int(qty) for _, qty in items], pa.int64()),
+            }
+        )
+
+    cut_record = result[2]
+    if hasattr(cut_record, "to_arrow"):
+        cut_log = cut_record.to_arrow()
+    else:
+        cut_log = pa.Table.from_pylist(list(cut_record))
+
+    return {
+        "rebar_estimates": length_table(result[0], "rebar_length"),
+        "unused_excess": length_table(result[1], "length"),
+        "cut_log": cut_log,
+    }
+
+
+def export_result(result: tuple, file_format: str = "csv", result_path: str = "results"):
+    """
+    Helper function to write results into a file. Returns three (3) files in a folder `results`.
+
+    Args:
+        result (tuple): Output of `get_estimate`.
+        file_format (str): One of **csv**, **parquet** or **arrow** (Arrow IPC file).
+            Parquet and Arrow files are written from the columnar result in one operation.
+        result_path (str): Folder to write the files into, created if missing.
+
+    """
+
+    if file_format not in ("csv", "parquet", "arrow"):
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+    # Create folder for results
+    os.makedirs(result_path, exist_ok=True)
+
+    if file_format != "csv":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for name, table in get_result_tables(result).items():
+            filename = os.path.join(result_path, f"{name}.{file_format}")
+            if file_format == "parquet":
+                pq.write_table(table, filename)
+            else:
+                with pa.ipc.new_file(filename, table.schema) as writer:
+                    writer.write_table(table)
+        return
+
+    # Write estimate result into a new file
+    with open(
+        os.path.join(result_path, "rebar_estimates.csv"),
+        "w",
+        encoding="utf-8-sig",
+        newline="",
+    ) as result_out:
+        columns = ("rebar_length", "quantity")
+        writer = csv.DictWriter(result_out, fieldnames=columns)
+        writer.writeheader()
+        for length, quantity in sorted(result[0].items()):
+            writer.writerow({"rebar_length": length, "quantity": quantity})
+
+    # Write unused excess list into a new file
+    with open(
+        os.path.join(result_path, "unused_excess.csv"),
+        "w",
+        encoding="utf-8-sig",
+        newline="",
+    ) as result_out:
+        columns = ("length", "quantity")
+        writer = csv.DictWriter(result_out, fieldnames=columns)
+        writer.writeheader()
+        for length, quantity in sorted(result[1].items()):
+            writer.writerow({"length": length, "quantity": quantity})
+
+    # Write cut logs into a new file
+    with open(
+        os.path.join(result_path, "cut_log.csv"),
+        "w",
+        encoding="utf-8-sig",
+        newline="",
+    ) as result_out:
+        columns = [
+            "produced_length",
+            "produced_qty",
+            "produced_type",
+            "from_length",
+            "from_length_type",
+        ]
+        writer = csv.DictWriter(result_out, fieldnames=columns)
+        writer.writeheader()
+        for row in result[2]:
+            writer.writerow(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,828 @@
+from collections import OrderedDict, defaultdict
+import json
+import math
+import os
+import threading
+import time
+
+from rebarcalc import (
+    Estimator,
+    clengths_metric,
+    from_fixed_length,
+    get_estimate_gap,
+    get_greedy_estimate,
+    prepare_cut_schedule,
+    to_fixed_length,
+)
+
+
+def _import_scipy_optimize():
+    """Returns `scipy.optimize`, which is only installed with the `computation` extra."""
+
+    try:
+        from scipy import optimize
+    except ImportError as error:
+        raise ImportError(
+            "This estimate mode requires scipy, install the 'computation' extra"
+        ) from error
+
+    return optimize
+
+
+def enumerate_patterns(
+    cut_lengths: list,
+    stock_lengths: list,
+    max_patterns: int = 2000,
+    deadline: float = math.inf,
+) -> list:
+    """
+    Enumerates every maximal cutting pattern of each commercial length, i.e. every
+    way to cut it where no further cut length fits in the remaining length.
+
+    Args:
+        cut_lengths (list): Integer cut lengths, largest first.
+        stock_lengths (list): Integer commercial lengths.
+        max_patterns (int): Stop and return **None** once more patterns than this are found.
+        deadline (float): `time.monotonic` time to stop at, raising **TimeoutError**.
+
+    Returns:
+        patterns (list): (stock index, pattern) for each pattern, where pattern is a
+        tuple with the quantity of each cut length.
+
+    """
+
+    patterns = []
+    last = len(cut_lengths) - 1
+    steps = 0
+
+    for stock_index, stock_length in enumerate(stock_lengths):
+        stack = [(0, stock_length, ())]
+        while stack:
+            index, remaining, prefix = stack.pop()
+            steps += 1
+            if steps % 4096 == 0 and time.monotonic() >= deadline:
+                raise TimeoutError("Pattern enumeration ran out of time")
+
+            # Fill what is left with the shortest cut length to keep the pattern maximal
+            if index == last:
+                pattern = prefix + (remaining // cut_lengths[last],)
+                if any(pattern):
+                    patterns.append((stock_index, pattern))
+                    if len(patterns) > max_patterns:
+                        return None
+                continue
+
+            for qty in range(remaining // cut_lengths[index] + 1):
+                stack.append(
+                    (index + 1, remaining - qty * cut_lengths[index], prefix + (qty,))
+                )
+
+    return patterns
+
+
+class PatternCache:
+    """
+    Bounded LRU cache of `enumerate_patterns` results.
+
+    Entries are keyed by the sorted commercial lengths and the set of cut lengths,
+    so estimates that reuse the same cut lengths skip enumeration entirely. Schedules
+    with more than **max_patterns** patterns are cached as such and not enumerated again.
+    Schedules with more than **max_cut_lengths** distinct cut lengths, which nearly
+    always have too many patterns, are not looked up at all.
+
+    Args:
+        maxsize (int): Maximum number of entries kept.
+        path (str): Optional JSON file the cache is loaded from and saved to.
+        max_patterns (int): See `enumerate_patterns`.
+        max_cut_lengths (int): Most distinct cut lengths to enumerate patterns of.
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        path: str = None,
+        max_patterns: int = 2000,
+        max_cut_lengths: int = 12,
+    ):
+        self.maxsize = maxsize
+        self.path = path
+        self.max_patterns = max_patterns
+        self.max_cut_lengths = max_cut_lengths
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: tuple, patterns: list):
+        self._entries[key] = patterns
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_patterns(
+        self, cut_lengths: list, stock_lengths: list, deadline: float = math.inf
+    ) -> list:
+        """
+        Returns the maximal cutting patterns of the given integer lengths, in the
+        order of **cut_lengths** and **stock_lengths**, or **None** if there are too
+        many or they are not enumerated before **deadline**. Enumerations cut short
+        by the deadline are not cached.
+
+        """
+
+        cut_key = tuple(sorted(set(cut_lengths), reverse=True))
+        if len(cut_key) > self.max_cut_lengths:
+            return None
+        stock_key = tuple(sorted(set(stock_lengths)))
+        key = (stock_key, cut_key)
+
+        with self._lock:
+            patterns = self._entries.get(key, ())
+            if patterns != ():
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if patterns == ():
+            try:
+                patterns = enumerate_patterns(
+                    list(cut_key), list(stock_key), self.max_patterns, deadline
+                )
+            except TimeoutError:
+                return None
+            with self._lock:
+                self.misses += 1
+                self._store(key, patterns)
+
+        if patterns is None:
+            return None
+
+        # Map normalized positions back to the caller's order
+        cut_order = [cut_key.index(cut_length) for cut_length in cut_lengths]
+        stock_order = {stock_key.index(length): index for index, length in enumerate(stock_lengths)}
+        return [
+            (stock_order[stock_index], tuple(pattern[position] for position in cut_order))
+            for stock_index, pattern in patterns
+        ]
+
+    def clear(self):
+        """Removes all entries from the cache."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def load(self):
+        """Loads entries from **path**, keeping the most recent up to **maxsize**."""
+
+        with open(self.path, encoding="utf-8") as cache_in:
+            entries = json.load(cache_in)
+
+        with self._lock:
+            for stock_key, cut_key, patterns in entries:
+                if patterns is not None:
+                    patterns = [(stock_index, tuple(pattern)) for stock_index, pattern in patterns]
+                self._store((tuple(stock_key), tuple(cut_key)), patterns)
+
+    def save(self):
+        """Writes the entries into **path**."""
+
+        with self._lock:
+            entries = [
+                [list(stock_key), list(cut_key), patterns]
+                for (stock_key, cut_key), patterns in self._entries.items()
+            ]
+
+        with open(self.path, "w", encoding="utf-8") as cache_out:
+            json.dump(entries, cache_out)
+
+
+pattern_cache = PatternCache()
+"""Default in-memory cache of cutting patterns used by `get_exact_estimate`"""
+
+
+def price_patterns(
+    cut_lengths: list,
+    max_qtys: list,
+    values: list,
+    stock_lengths: list,
+) -> list:
+    """
+    Finds the most valuable cutting pattern of every commercial length.
+
+    Solves one bounded knapsack by dynamic programming over integer lengths up to
+    the longest commercial length, then reads the best pattern of each shorter
+    commercial length off the same table.
+
+    Args:
+        cut_lengths (list): Integer cut lengths.
+        max_qtys (list): Maximum quantity of each cut length in one pattern.
+        values (list): Value of one piece of each cut length.
+        stock_lengths (list): Integer commercial lengths.
+
+    Returns:
+        patterns (list): (value, pattern) for each commercial length, where pattern
+        is a tuple with the quantity of each cut length.
+
+    """
+
+    import numpy as np
+
+    capacity = max(stock_lengths)
+
+    # Binary splitting turns each bounded cut length into a few 0/1 items
+    items = []
+    for index, max_qty in enumerate(max_qtys):
+        count = 1
+        while max_qty > 0:
+            items.append((index, min(count, max_qty)))
+            max_qty -= count
+            count *= 2
+
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((len(items), capacity + 1), dtype=bool)
+    for item, (index, count) in enumerate(items):
+        weight = cut_lengths[index] * count
+        if weight > capacity:
+            continue
+        candidate = best[: capacity + 1 - weight] + values[index] * count
+        improved = candidate > best[weight:] + 1e-12
+        best[weight:][improved] = candidate[improved]
+        taken[item, weight:] = improved
+
+    patterns = []
+    for stock_length in stock_lengths:
+        pattern = [0] * len(cut_lengths)
+        remaining = stock_length
+        for item in reversed(range(len(items))):
+            if taken[item, remaining]:
+                index, count = items[item]
+                pattern[index] += count
+                remaining -= cut_lengths[index] * count
+        patterns.append((float(best[stock_length]), tuple(pattern)))
+
+    return patterns
+
+
+def generate_patterns(
+    cut_lengths: list,
+    quantities: list,
+    stock_lengths: list,
+    costs: list = None,
+    deadline: float = math.inf,
+    initial_patterns: list = (),
+    available: list = None,
+    cut_cost: float = 0.0,
+) -> tuple:
+    """
+    Generates cutting patterns for the LP relaxation of the cutting stock problem
+    by column generation.
+
+    Args:
+        cut_lengths (list): Integer cut lengths.
+        quantities (list): Required quantity of each cut length.
+        stock_lengths (list): Integer commercial lengths.
+        costs (list): Cost of one bar of each commercial length. Default is its length,
+            which minimizes the total length of steel used.
+        deadline (float): `time.monotonic` time to stop generating patterns.
+        initial_patterns (list): (stock index, pattern) columns to start from, e.g.
+            from `PatternCache`. No new pattern is generated if these include every
+            maximal pattern.
+        available (list): Maximum quantity of bars of each commercial length, **None**
+            where unlimited. Default is unlimited for all.
+        cut_cost (float): Cost of cutting one piece, added to the cost of each pattern.
+
+    Returns:
+        patterns (list): (stock index, pattern) for each generated column.
+        lp_counts (ndarray): Quantity of each pattern in the last LP solved in time,
+            zero for the patterns generated after it.
+        lp_bound (float): Objective value of the last LP solved in time.
+        Raises **TimeoutError** if no LP is solved before **deadline**.
+
+    """
+
+    import numpy as np
+
+    optimize = _import_scipy_optimize()
+
+    if costs is None:
+        costs = list(stock_lengths)
+    limited = [
+        stock_index
+        for stock_index, limit in enumerate(available or ())
+        if limit is not None and limit != math.inf
+    ]
+    demand = np.asarray(quantities, dtype=float)
+    max_qtys = [
+        min(quantity, max(stock_lengths) // cut_length)
+        for cut_length, quantity in zip(cut_lengths, quantities)
+    ]
+
+    # Start from the cheapest pattern per piece of each cut length alone
+    patterns = []
+    for index, (cut_length, quantity) in enumerate(zip(cut_lengths, quantities)):
+        stock_index = min(
+            (
+                stock_index
+                for stock_index, stock_length in enumerate(stock_lengths)
+                if stock_length >= cut_length
+            ),
+            key=lambda stock_index: costs[stock_index]
+            / min(quantity, stock_lengths[stock_index] // cut_length),
+        )
+        pattern = [0] * len(cut_lengths)
+        pattern[index] = min(quantity, stock_lengths[stock_index] // cut_length)
+        patterns.append((stock_index, tuple(pattern)))
+    known_patterns = set(patterns)
+    for column in initial_patterns:
+        if column not in known_patterns:
+            patterns.append(column)
+            known_patterns.add(column)
+    if time.monotonic() >= deadline:
+        raise TimeoutError("No time left to solve the cutting pattern LP")
+    matrix = np.array([pattern for _, pattern in patterns], dtype=float).T
+    stock_indexes = np.array([stock_index for stock_index, _ in patterns])
+
+    # While availability rules out the starting patterns, shortfall columns priced
+    # above any bar keep the LP feasible so that column generation can proceed
+    shortfall_cost = 2 * (max(costs) + cut_cost) + 1
+    shortfall = np.eye(len(cut_lengths)) if limited else np.zeros((len(cut_lengths), 0))
+
+    solved = None
+    while True:
+        pattern_costs = pattern_cost_array(stock_indexes, matrix, costs, cut_cost)
+        rows = [np.hstack([-matrix, -shortfall])]
+        bounds = [-demand]
+        for stock_index in limited:
+            in_stock = stock_indexes == stock_index
+            rows.append(np.append(in_stock, np.zeros(shortfall.shape[1]))[np.newaxis])
+            bounds.append([available[stock_index]])
+
+        remaining = max(deadline - time.monotonic(), 0.01)
+        lp = optimize.linprog(
+            np.append(pattern_costs, np.full(shortfall.shape[1], shortfall_cost)),
+            A_ub=np.vstack(rows),
+            b_ub=np.concatenate(bounds),
+            bounds=(0, None),
+            method="highs",
+            options={"time_limit": remaining},
+        )
+        if lp.status == 1:
+            # Out of time, keep the last LP solved
+            break
+        if lp.status != 0:
+            raise RuntimeError(f"Cutting pattern LP failed: {lp.message}")
+        solved = (len(patterns), lp)
+        if time.monotonic() >= deadline:
+            break
+
+        # Add every pattern with negative reduced cost under the current duals
+        duals = -lp.ineqlin.marginals[: len(cut_lengths)]
+        stock_duals = [0.0] * len(stock_lengths)
+        for stock_index, marginal in zip(limited, lp.ineqlin.marginals[len(cut_lengths) :]):
+            stock_duals[stock_index] = marginal
+        new_columns = []
+        priced = price_patterns(cut_lengths, max_qtys, duals - cut_cost, stock_lengths)
+        for stock_index, (value, pattern) in enumerate(priced):
+            column = (stock_index, pattern)
+            reduced_cost = costs[stock_index] - stock_duals[stock_index] - value
+            if reduced_cost < -1e-9 * costs[stock_index]:
+                if column not in known_patterns:
+                    new_columns.append(column)
+                    known_patterns.add(column)
+        if not new_columns:
+            break
+
+        patterns.extend(new_columns)
+        matrix = np.hstack([matrix, np.array([pattern for _, pattern in new_columns]).T])
+        stock_indexes = np.append(stock_indexes, [stock_index for stock_index, _ in new_columns])
+
+    if solved is None:
+        raise TimeoutError("Cutting pattern LP ran out of time")
+
+    columns, lp = solved
+    lp_counts = np.zeros(len(patterns))
+    lp_counts[:columns] = lp.x[:columns]
+    return patterns, lp_counts, lp.fun
+
+
+def pattern_cost_array(stock_indexes, matrix, costs: list, cut_cost: float = 0.0):
+    """
+    Returns the cost of each pattern, given the commercial length index of each
+    pattern and the patterns as columns of **matrix**: its bar plus one cut per piece.
+
+    """
+
+    import numpy as np
+
+    return np.asarray(costs, dtype=float)[stock_indexes] + cut_cost * matrix.sum(axis=0)
+
+
+def round_patterns(
+    patterns: list,
+    lp_counts: list,
+    quantities: list,
+    costs: list,
+    deadline: float = math.inf,
+    rel_gap: float = 1e-3,
+    available: list = None,
+    cut_cost: float = 0.0,
+) -> dict:
+    """
+    Returns an integer quantity of each pattern that does not overproduce any cut length.
+
+    Solves the integer program over the generated patterns until **deadline** or
+    until within **rel_gap** of optimal, falling back to rounding down the LP solution. Pieces produced beyond the
+    required quantity are removed from their patterns. Any shortfall is left for
+    the caller to cover. See `generate_patterns` for **available** and **cut_cost**.
+    Raises **ValueError** if the available bars cannot cover the quantities.
+
+    """
+
+    import numpy as np
+
+    optimize = _import_scipy_optimize()
+
+    matrix = np.array([pattern for _, pattern in patterns], dtype=float).T
+    stock_indexes = np.array([stock_index for stock_index, _ in patterns])
+    pattern_costs = pattern_cost_array(stock_indexes, matrix, costs, cut_cost)
+    constraints = [optimize.LinearConstraint(matrix, lb=quantities, ub=np.inf)]
+    for stock_index, limit in enumerate(available or ()):
+        if limit is not None and limit != math.inf:
+            in_stock = stock_indexes == stock_index
+            constraints.append(optimize.LinearConstraint(in_stock, lb=0, ub=limit))
+
+    counts = None
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        solution = optimize.milp(
+            pattern_costs,
+            constraints=constraints,
+            integrality=np.ones(len(patterns)),
+            bounds=optimize.Bounds(0, np.inf),
+            options={"time_limit": remaining, "mip_rel_gap": rel_gap},
+        )
+        if solution.x is not None:
+            counts = np.round(solution.x).astype(int)
+        elif solution.status == 2:
+            raise ValueError("Available commercial lengths cannot cover the cut schedule")
+    if counts is None:
+        counts = np.floor(np.asarray(lp_counts) + 1e-9).astype(int)
+
+    used = np.nonzero(counts > 0)[0]
+    surplus = np.rint(matrix[:, used] @ counts[used]).astype(int) - np.asarray(quantities)
+    pattern_counts = defaultdict(int)
+    holders = defaultdict(list)
+    for position in used.tolist():
+        pattern_counts[patterns[position]] += int(counts[position])
+    for index, position in zip(*np.nonzero(matrix[:, used])):
+        holders[int(index)].append(patterns[used[position]])
+
+    # Remove pieces produced beyond the required quantity. A pattern reduced at one
+    # cut length still holds the other cut lengths of the pattern it comes from.
+    derived = defaultdict(list)
+    for index in np.nonzero(surplus > 0)[0].tolist():
+        remaining = int(surplus[index])
+        for origin in holders[index]:
+            for column in [origin, *derived[origin]]:
+                stock_index, pattern = column
+                if pattern[index] == 0:
+                    continue
+                while remaining > 0 and pattern_counts[column] > 0:
+                    removed = min(pattern[index], remaining)
+                    moved = min(pattern_counts[column], remaining // removed)
+                    reduced = list(pattern)
+                    reduced[index] -= removed
+                    reduced = (stock_index, tuple(reduced))
+                    if reduced not in pattern_counts:
+                        derived[origin].append(reduced)
+                    pattern_counts[column] -= moved
+                    pattern_counts[reduced] += moved
+                    remaining -= removed * moved
+            if remaining <= 0:
+                break
+
+    return {
+        column: count
+        for column, count in pattern_counts.items()
+        if count > 0 and any(column[1])
+    }
+
+
+def record_patterns(
+    estimator: Estimator,
+    pattern_counts: dict,
+    cut_lengths: list,
+    stock_lengths: list,
+):
+    """Records the cuts, excess and commercial lengths of the chosen patterns on **estimator**."""
+
+    import numpy as np
+
+    if not pattern_counts:
+        return
+
+    columns = list(pattern_counts)
+    matrix = np.array([pattern for _, pattern in columns], dtype=np.int64)
+    used_lengths = (matrix @ np.asarray(cut_lengths, dtype=np.int64)).tolist()
+    pieces = defaultdict(list)
+    for position, index in zip(*np.nonzero(matrix)):
+        pieces[int(position)].append(int(index))
+
+    for position, (stock_index, pattern) in enumerate(columns):
+        count = pattern_counts[(stock_index, pattern)]
+        stock_length = stock_lengths[stock_index]
+        estimator.estimate_result[stock_length] += count
+
+        for index in pieces[position]:
+            estimator.record_cut(
+                cut_lengths[index], pattern[index] * count, "cut length", stock_length, "new rebar"
+            )
+
+        excess_length = stock_length - used_lengths[position]
+        if excess_length > 0:
+            estimator.excess_inventory[excess_length] += count
+            estimator.record_cut(excess_length, count, "excess", stock_length, "new rebar")
+
+def get_shortfall(pattern_counts: dict, cut_lengths: list, quantities: list) -> list:
+    """Returns the (cut_length, quantity) still required after the chosen patterns, longest first."""
+
+    import numpy as np
+
+    produced = [0] * len(cut_lengths)
+    if pattern_counts:
+        matrix = np.array([pattern for _, pattern in pattern_counts], dtype=np.int64)
+        counts = np.fromiter(pattern_counts.values(), dtype=np.int64, count=len(pattern_counts))
+        produced = (counts @ matrix).tolist()
+
+    return [
+        (cut_length, quantity - qty_produced)
+        for cut_length, quantity, qty_produced in zip(cut_lengths, quantities, produced)
+        if quantity > qty_produced
+    ]
+
+
+def pack_shortfall(
+    residual: list, cut_lengths: list, stock_lengths: list, bars_left: list
+) -> dict:
+    """
+    Packs the **residual** of `get_shortfall` into new bars, using at most the
+    number of bars of each commercial length in **bars_left** (**None** where
+    unlimited). Raises **ValueError** if they are not enough.
+
+    Each bar starts from the longest commercial length left that fits the longest
+    remaining piece, is filled longest first, then cut from the shortest
+    commercial length left that holds its pieces. Identical bars are repeated at
+    once, so large shortfalls take few steps.
+
+    Returns:
+        pattern_counts (dict): Quantity of each (stock index, pattern), as used by
+        `record_patterns`.
+
+    """
+
+    positions = {cut_length: index for index, cut_length in enumerate(cut_lengths)}
+    shortfall = [0] * len(cut_lengths)
+    for cut_length, quantity in residual:
+        shortfall[positions[cut_length]] += quantity
+    bars_left = list(bars_left)
+
+    pattern_counts = defaultdict(int)
+    for index, cut_length in enumerate(cut_lengths):
+        while shortfall[index] > 0:
+            open_stocks = [
+                stock_index
+                for stock_index, left in enumerate(bars_left)
+                if (left is None or left > 0) and stock_lengths[stock_index] >= cut_length
+            ]
+            if not open_stocks:
+                raise ValueError("Available commercial lengths cannot cover the cut schedule")
+
+            pattern = [0] * len(cut_lengths)
+            remaining = stock_lengths[open_stocks[-1]]
+            for other in range(index, len(cut_lengths)):
+                qty = min(shortfall[other], remaining // cut_lengths[other])
+                pattern[other] = qty
+                remaining -= qty * cut_lengths[other]
+
+            used_length = stock_lengths[open_stocks[-1]] - remaining
+            stock_index = next(
+                stock_index
+                for stock_index in open_stocks
+                if stock_lengths[stock_index] >= used_length
+            )
+            count = min(
+                shortfall[other] // qty for other, qty in enumerate(pattern) if qty > 0
+            )
+            if bars_left[stock_index] is not None:
+                count = min(count, bars_left[stock_index])
+                bars_left[stock_index] -= count
+
+            pattern_counts[(stock_index, tuple(pattern))] += count
+            for other, qty in enumerate(pattern):
+                shortfall[other] -= qty * count
+
+    return dict(pattern_counts)
+
+
+def get_exact_estimate(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    time_limit: float = 10.0,
+    cache: PatternCache = pattern_cache,
+) -> list:
+    """
+    Estimates rebars by solving the cutting stock problem over mixed cutting patterns.
+
+    Cutting patterns are generated by column generation on the LP relaxation, then
+    an integer quantity of each pattern is chosen within **time_limit**. Any cut
+    length not covered by the rounded patterns is estimated with the greedy engine,
+    drawing on the excess of the patterns first. If the greedy estimate already
+    meets the lower bound of `get_lower_bounds`, it is returned without solving,
+    and it is also returned if no time is left for the integer program or if it
+    uses no more steel than the solved patterns. The greedy estimate is the better
+    of the fixed-point and floating point one (see `get_greedy_estimate`).
+    Requires the `computation` extra.
+
+    Args:
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths to use.
+        time_limit (float): Approximate time limit in seconds.
+        cache (PatternCache): Cache of enumerated cutting patterns used as starting
+            columns. Pass **None** to rely on column generation alone.
+
+    Returns:
+        The same (estimate_result, excess_inventory, cut_record) as `get_estimate`.
+
+    """
+
+    deadline = time.monotonic() + time_limit
+    cut_schedule = list(cut_schedule)
+    cut_lengths, quantities, stock_lengths = prepare_cut_schedule(cut_schedule, wclengths)
+
+    # Nothing beats an estimate that already uses the least possible steel
+    greedy_result = get_greedy_estimate(cut_schedule, wclengths)
+    if get_estimate_gap(greedy_result, cut_schedule, wclengths)["optimal"]:
+        return greedy_result
+
+    estimator = Estimator(fixed_point=True)
+    if cut_lengths:
+        # Solve in units of the largest common divisor to keep the knapsack small
+        unit = math.gcd(*cut_lengths, *stock_lengths)
+        units_cut = [cut_length // unit for cut_length in cut_lengths]
+        units_stock = [stock_length // unit for stock_length in stock_lengths]
+
+        initial_patterns = None
+        if cache is not None:
+            initial_patterns = cache.get_patterns(cut_lengths, stock_lengths, deadline)
+
+        try:
+            patterns, lp_counts, _ = generate_patterns(
+                units_cut,
+                quantities,
+                units_stock,
+                deadline=deadline,
+                initial_patterns=initial_patterns or (),
+            )
+        except TimeoutError:
+            return greedy_result
+
+        # Without time for the integer program, rounding down the LP solution rarely
+        # beats greedy and is not worth overrunning the time limit
+        if time.monotonic() >= deadline:
+            return greedy_result
+        pattern_counts = round_patterns(
+            patterns, lp_counts, quantities, units_stock, deadline=deadline
+        )
+        record_patterns(estimator, pattern_counts, cut_lengths, stock_lengths)
+
+        # Cover any shortfall left by rounding with the greedy engine
+        residual = get_shortfall(pattern_counts, cut_lengths, quantities)
+        estimator.estimate_cut_schedule(residual, stock_lengths)
+
+    # Rounding down a partial LP solution out of time can do worse than greedy
+    greedy_steel = sum(length * qty for length, qty in greedy_result[0].items())
+    steel = sum(length * qty for length, qty in estimator.estimate_result.items())
+    if to_fixed_length(greedy_steel) <= steel:
+        return greedy_result
+
+    estimator.convert_from_fixed()
+    return estimator.estimate_result, estimator.excess_inventory, estimator.cut_record
+
+
+def get_cost_estimate(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    prices: dict = None,
+    available: dict = None,
+    cut_cost: float = 0.0,
+    time_limit: float = 10.0,
+) -> list:
+    """
+    Estimates rebars at the least total cost, given the price and the available
+    quantity of each commercial length.
+
+    Solves the same pattern integer program as `get_exact_estimate`, with each
+    pattern costing the price of its bar plus **cut_cost** per piece, and at most
+    the available quantity of bars of each commercial length. Repeated cut lengths
+    are merged into one demand row beforehand, so the problem size depends on the
+    distinct cut lengths only. Requires the `computation` extra.
+
+    Args:
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths to use.
+        prices (dict): Price of one bar of each commercial length. Lengths not
+            listed are priced at their length, i.e. by steel used.
+        available (dict): Maximum quantity of bars of each commercial length.
+            Lengths not listed are unlimited.
+        cut_cost (float): Cost of cutting one piece.
+        time_limit (float): Approximate time limit in seconds.
+
+    Returns:
+        The same (estimate_result, excess_inventory, cut_record) as `get_estimate`.
+        Raises **ValueError** if the available bars cannot cover the cut schedule.
+
+    """
+
+    deadline = time.monotonic() + time_limit
+    cut_lengths, quantities, stock_lengths = prepare_cut_schedule(cut_schedule, wclengths)
+
+    prices = {to_fixed_length(length): price for length, price in (prices or {}).items()}
+    available = {
+        to_fixed_length(length): limit for length, limit in (available or {}).items()
+    }
+    costs = [prices.get(stock, from_fixed_length(stock)) for stock in stock_lengths]
+    limits = [available.get(stock) for stock in stock_lengths]
+
+    estimator = Estimator(fixed_point=True)
+    if cut_lengths:
+        unit = math.gcd(*cut_lengths, *stock_lengths)
+        units_cut = [cut_length // unit for cut_length in cut_lengths]
+        units_stock = [stock_length // unit for stock_length in stock_lengths]
+
+        try:
+            patterns, lp_counts, _ = generate_patterns(
+                units_cut,
+                quantities,
+                units_stock,
+                costs,
+                deadline=deadline,
+                available=limits,
+                cut_cost=cut_cost,
+            )
+            pattern_counts = round_patterns(
+                patterns,
+                lp_counts,
+                quantities,
+                costs,
+                deadline=deadline,
+                available=limits,
+                cut_cost=cut_cost,
+            )
+        except TimeoutError:
+            pattern_counts = {}
+
+        # A shortfall is only left if the solver ran out of time, cover it from the
+        # bars of each commercial length still available
+        used = defaultdict(int)
+        for (stock_index, _), count in pattern_counts.items():
+            used[stock_index] += count
+        bars_left = [
+            None if limit is None else limit - used[stock_index]
+            for stock_index, limit in enumerate(limits)
+        ]
+        residual = get_shortfall(pattern_counts, cut_lengths, quantities)
+        for column, count in pack_shortfall(
+            residual, cut_lengths, stock_lengths, bars_left
+        ).items():
+            pattern_counts[column] = pattern_counts.get(column, 0) + count
+        record_patterns(estimator, pattern_counts, cut_lengths, stock_lengths)
+
+    estimator.convert_from_fixed()
+    return estimator.estimate_result, estimator.excess_inventory, estimator.cut_record
+
+
+def get_estimate_cost(result: list, prices: dict = None, cut_cost: float = 0.0) -> float:
+    """
+    Returns the total cost of an estimate: the price of its bars, as in
+    `get_cost_estimate`, plus **cut_cost** per piece cut.
+
+    """
+
+    estimate_result, _, cut_record = result
+    prices = prices or {}
+    steel_cost = sum(
+        prices.get(clength, clength) * qty for clength, qty in estimate_result.items()
+    )
+    pieces = sum(
+        record["produced_qty"]
+        for record in cut_record
+        if record["produced_type"] == "cut length"
+    )
+
+    return steel_cost + cut_cost * pieces
@@ -0,0 +1,196 @@
+from collections import Counter
+import math
+
+from rebarcalc import Estimator, clengths_metric, prepare_cut_schedule, to_fixed_length
+
+
+class CapacityTree:
+    """
+    Segment tree counting open bars by their integer remaining length.
+
+    Finding the open bar with the tightest remaining length for a piece, and
+    updating a bar after a cut, take O(log n) steps in the longest length n.
+
+    """
+
+    def __init__(self, max_length: int):
+        size = 1
+        while size <= max_length:
+            size *= 2
+        self.size = size
+        self.counts = [0] * (2 * size)
+
+    def add(self, length: int, qty: int = 1):
+        """Adds **qty** open bars with remaining **length** (removes them if negative)."""
+
+        counts = self.counts
+        index = length + self.size
+        while index:
+            counts[index] += qty
+            index //= 2
+
+    def find_at_least(self, length: int):
+        """Returns the shortest remaining length of an open bar that is at least **length**, or **None**."""
+
+        counts = self.counts
+        size = self.size
+        if length >= size:
+            return None
+
+        index = length + size
+        if counts[index]:
+            return length
+
+        # Climb until a right sibling holds an open bar, then descend to its leftmost one
+        while index > 1:
+            if index % 2 == 0 and counts[index + 1]:
+                index += 1
+                while index < size:
+                    index *= 2
+                    if not counts[index]:
+                        index += 1
+                return index - size
+            index //= 2
+
+        return None
+
+
+def pack_best_fit(
+    cut_lengths: list,
+    quantities: list,
+    stock_length: int,
+    offcut_lengths: list = (),
+) -> list:
+    """
+    Packs every piece, longest first, into the open bar with the tightest remaining
+    length that fits it, opening a new bar of **stock_length** when none fits.
+
+    Args:
+        cut_lengths (list): Integer cut lengths, longest first.
+        quantities (list): Required quantity of each cut length.
+        stock_length (int): Integer length of new bars.
+        offcut_lengths (list): Integer lengths of offcuts open before packing.
+
+    Returns:
+        bars (list): (bar length, is_offcut, pieces) for each used bar, where pieces
+        lists the index of each cut length cut from it.
+
+    """
+
+    tree = CapacityTree(max([stock_length, *offcut_lengths]))
+    bar_lengths = []
+    bar_offcut = []
+    bar_pieces = []
+    open_bars = {}
+
+    def open_bar(length: int, is_offcut: bool):
+        bar_lengths.append(length)
+        bar_offcut.append(is_offcut)
+        bar_pieces.append([])
+        open_bars.setdefault(length, []).append(len(bar_lengths) - 1)
+        tree.add(length)
+
+    for offcut_length in offcut_lengths:
+        open_bar(offcut_length, True)
+
+    for index, (cut_length, quantity) in enumerate(zip(cut_lengths, quantities)):
+        for _ in range(quantity):
+            remaining = tree.find_at_least(cut_length)
+            if remaining is None:
+                open_bar(stock_length, False)
+                remaining = stock_length
+
+            bar = open_bars[remaining].pop()
+            tree.add(remaining, -1)
+            bar_pieces[bar].append(index)
+
+            remaining -= cut_length
+            open_bars.setdefault(remaining, []).append(bar)
+            tree.add(remaining)
+
+    return [
+        (length, is_offcut, pieces)
+        for length, is_offcut, pieces in zip(bar_lengths, bar_offcut, bar_pieces)
+        if pieces
+    ]
+
+
+def get_best_fit_estimate(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    excess_inventory: dict = None,
+) -> list:
+    """
+    Estimates rebars by best fit decreasing packing of individual cut lengths.
+
+    Unlike `get_estimate`, different cut lengths can share the same bar. New bars
+    are opened at the longest commercial length, and each is then cut from the
+    shortest commercial length that holds its pieces.
+
+    Args:
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths to use.
+        excess_inventory (dict): Quantity of each excess length available before
+            packing. These are used before any new bar when they fit tighter.
+
+    Returns:
+        The same (estimate_result, excess_inventory, cut_record) as `get_estimate`.
+
+    """
+
+    cut_lengths, quantities, stock_lengths = prepare_cut_schedule(cut_schedule, wclengths)
+    offcut_lengths = [
+        to_fixed_length(length)
+        for length, qty in (excess_inventory or {}).items()
+        for _ in range(int(qty))
+    ]
+
+    estimator = Estimator(fixed_point=True)
+    for offcut_length in offcut_lengths:
+        estimator.excess_inventory[offcut_length] += 1
+
+    if cut_lengths:
+        # Pack in units of the largest common divisor to keep the tree small
+        unit = math.gcd(*cut_lengths, *stock_lengths, *offcut_lengths)
+        bars = pack_best_fit(
+            [cut_length // unit for cut_length in cut_lengths],
+            quantities,
+            stock_lengths[-1] // unit,
+            [offcut_length // unit for offcut_length in offcut_lengths],
+        )
+
+        # Group bars cut the same way
+        patterns = Counter()
+        for length, is_offcut, pieces in bars:
+            used_length = sum(cut_lengths[index] for index in pieces)
+            if is_offcut:
+                bar_length = length * unit
+            else:
+                bar_length = next(
+                    stock for stock in stock_lengths if stock >= used_length
+                )
+            patterns[(bar_length, is_offcut, tuple(sorted(Counter(pieces).items())))] += 1
+
+        for (bar_length, is_offcut, pieces), count in patterns.items():
+            bar_type = "excess rebar" if is_offcut else "new rebar"
+            if is_offcut:
+                estimator.excess_inventory[bar_length] -= count
+                if estimator.excess_inventory[bar_length] <= 0:
+                    estimator.excess_inventory.pop(bar_length)
+            else:
+                estimator.estimate_result[bar_length] += count
+
+            for index, qty in pieces:
+                estimator.record_cut(
+                    cut_lengths[index], qty * count, "cut length", bar_length, bar_type
+                )
+
+            excess_length = bar_length - sum(
+                cut_lengths[index] * qty for index, qty in pieces
+            )
+            if excess_length > 0:
+                estimator.excess_inventory[excess_length] += count
+                estimator.record_cut(excess_length, count, "excess", bar_length, bar_type)
+
+    estimator.convert_from_fixed()
+    return estimator.estimate_result, estimator.excess_inventory, estimator.cut_record
@@ -0,0 +1,313 @@
+from bisect import bisect_left, insort
+from collections import Counter
+import math
+import random
+import time
+
+from rebarcalc import (
+    Estimator,
+    clengths_metric,
+    from_fixed_length,
+    get_greedy_estimate,
+    get_lower_bounds,
+    get_optimal_clength,
+    prepare_cut_schedule,
+)
+
+
+def get_greedy_bars(cut_lengths: list, quantities: list, stock_lengths: list) -> list:
+    """
+    Bar by bar version of the greedy engine: each cut length, longest first, is cut
+    from the longest remaining lengths of earlier bars that fit it, then from new
+    bars of its optimal commercial length.
+
+    Args:
+        cut_lengths (list): Integer cut lengths, longest first.
+        quantities (list): Required quantity of each cut length.
+        stock_lengths (list): Integer commercial lengths, shortest first.
+
+    Returns:
+        bars (list): [stock_length, used_length, pieces] for each bar, where pieces
+        lists the index of each cut length cut from it.
+
+    """
+
+    bars = []
+    remaining_lengths = []
+    remaining_bars = {}
+
+    def add_remaining(bar: int, length: int):
+        if length > 0:
+            if length not in remaining_bars:
+                insort(remaining_lengths, length)
+                remaining_bars[length] = []
+            remaining_bars[length].append(bar)
+
+    for index, (cut_length, quantity) in enumerate(zip(cut_lengths, quantities)):
+        # Use the longest remaining lengths first
+        while quantity > 0 and remaining_lengths and remaining_lengths[-1] >= cut_length:
+            length = remaining_lengths[-1]
+            bar = remaining_bars[length].pop()
+            if not remaining_bars[length]:
+                del remaining_bars[length]
+                remaining_lengths.pop()
+
+            qty = min(quantity, length // cut_length)
+            bars[bar][1] += cut_length * qty
+            bars[bar][2].extend([index] * qty)
+            quantity -= qty
+            add_remaining(bar, length - cut_length * qty)
+
+        stock_length = get_optimal_clength(cut_length, stock_lengths)
+        yield_qty = stock_length // cut_length
+        while quantity > 0:
+            qty = min(quantity, yield_qty)
+            bars.append([stock_length, cut_length * qty, [index] * qty])
+            quantity -= qty
+            add_remaining(len(bars) - 1, stock_length - cut_length * qty)
+
+    return bars
+
+
+class LocalSearch:
+    """
+    Anytime local search over explicit bars, minimizing the total commercial length.
+
+    Each step takes one of the worst utilized bars among a small random sample and
+    either swaps a piece with another bar, or repacks it together with a few random
+    bars by best fit decreasing, cutting every new bar from the shortest commercial
+    length that holds its pieces. Steps that keep the total commercial length while
+    filling bars more unevenly are also accepted, which empties bars over time.
+
+    Args:
+        bars (list): Initial solution as returned by `get_greedy_bars`.
+        cut_lengths (list): Integer cut lengths referenced by the bars.
+        stock_lengths (list): Integer commercial lengths, shortest first.
+        seed (int): Seed of the random choices.
+
+    """
+
+    def __init__(self, bars: list, cut_lengths: list, stock_lengths: list, seed: int = 0):
+        self.bars = [[stock, used, list(pieces)] for stock, used, pieces in bars]
+        self.cut_lengths = cut_lengths
+        self.stock_lengths = stock_lengths
+        self.random = random.Random(seed)
+        self.steps = 0
+
+        # Bars are cut down to the shortest commercial length that holds them
+        for bar in self.bars:
+            self._downsize(bar)
+        self.steel = sum(bar[0] for bar in self.bars)
+
+    def _shortest_stock(self, used_length: int) -> int:
+        return self.stock_lengths[bisect_left(self.stock_lengths, used_length)]
+
+    def _downsize(self, bar: list):
+        bar[0] = self._shortest_stock(bar[1])
+
+    def _sample_worst(self, size: int = 8) -> int:
+        """Returns the least utilized bar among **size** random bars."""
+
+        bars = self.bars
+        candidates = [self.random.randrange(len(bars)) for _ in range(size)]
+        return max(candidates, key=lambda bar: (bars[bar][0] - bars[bar][1]) / bars[bar][0])
+
+    def step(self):
+        """Tries one move and keeps it if it does not make the solution worse."""
+
+        self.steps += 1
+        if len(self.bars) < 2:
+            return
+
+        worst = self._sample_worst()
+        if self.random.random() < 0.5:
+            other = self.random.randrange(len(self.bars))
+            if other != worst:
+                self._swap(worst, other)
+        else:
+            chosen = {worst}
+            size = min(len(self.bars), self.random.randint(2, 4))
+            while len(chosen) < size:
+                chosen.add(self.random.randrange(len(self.bars)))
+            self._repack(sorted(chosen))
+
+    def _swap(self, first: int, second: int):
+        """Swaps the first pair of pieces between two bars that improves them."""
+
+        bar_a, bar_b = self.bars[first], self.bars[second]
+        cut_lengths = self.cut_lengths
+        longest = self.stock_lengths[-1]
+        old_steel = bar_a[0] + bar_b[0]
+        old_square = bar_a[1] ** 2 + bar_b[1] ** 2
+
+        for position_a, piece_a in enumerate(bar_a[2]):
+            for position_b, piece_b in enumerate(bar_b[2]):
+                delta = cut_lengths[piece_b] - cut_lengths[piece_a]
+                if delta == 0:
+                    continue
+                used_a, used_b = bar_a[1] + delta, bar_b[1] - delta
+                if used_a > longest or used_b > longest:
+                    continue
+
+                new_steel = self._shortest_stock(used_a) + self._shortest_stock(used_b)
+                if new_steel < old_steel or (
+                    new_steel == old_steel and used_a**2 + used_b**2 > old_square
+                ):
+                    bar_a[2][position_a], bar_b[2][position_b] = piece_b, piece_a
+                    bar_a[1], bar_b[1] = used_a, used_b
+                    self._downsize(bar_a)
+                    self._downsize(bar_b)
+                    self.steel += new_steel - old_steel
+                    return
+
+    def _repack(self, chosen: list):
+        """Repacks the pieces of the chosen bars if that does not add length."""
+
+        bars = self.bars
+        cut_lengths = self.cut_lengths
+        longest = self.stock_lengths[-1]
+
+        pieces = sorted(
+            (piece for bar in chosen for piece in bars[bar][2]),
+            key=lambda piece: cut_lengths[piece],
+            reverse=True,
+        )
+
+        # Best fit decreasing into bars of the longest commercial length
+        packed = []
+        for piece in pieces:
+            length = cut_lengths[piece]
+            best = None
+            for bar in packed:
+                if bar[1] + length <= longest and (best is None or bar[1] > best[1]):
+                    best = bar
+            if best is None:
+                best = [longest, 0, []]
+                packed.append(best)
+            best[1] += length
+            best[2].append(piece)
+
+        for bar in packed:
+            self._downsize(bar)
+
+        old_steel = sum(bars[bar][0] for bar in chosen)
+        new_steel = sum(bar[0] for bar in packed)
+        old_square = sum(bars[bar][1] ** 2 for bar in chosen)
+        new_square = sum(bar[1] ** 2 for bar in packed)
+        if new_steel > old_steel or (new_steel == old_steel and new_square < old_square):
+            return
+
+        # Replace the chosen bars, removing those no longer needed
+        for bar, new_bar in zip(chosen, packed):
+            bars[bar] = new_bar
+        for bar in sorted(chosen[len(packed) :], reverse=True):
+            bars[bar] = bars[-1]
+            bars.pop()
+        bars.extend(packed[len(chosen) :])
+        self.steel += new_steel - old_steel
+
+    def get_pattern_counts(self) -> dict:
+        """
+        Returns the quantity of bars cut the same way, keyed by (stock_length,
+        pattern), where pattern lists the nonzero (cut length index, qty) pairs.
+
+        """
+
+        bars = Counter((stock, tuple(sorted(pieces))) for stock, _, pieces in self.bars)
+        pattern_counts = Counter()
+        for (stock, pieces), count in bars.items():
+            pattern_counts[(stock, tuple(sorted(Counter(pieces).items())))] += count
+
+        return pattern_counts
+
+
+def record_bars(estimator: Estimator, pattern_counts: dict, cut_lengths: list):
+    """Records the cuts, excess and commercial lengths of `LocalSearch.get_pattern_counts` on **estimator**."""
+
+    for (stock_length, pattern), count in pattern_counts.items():
+        estimator.estimate_result[stock_length] += count
+
+        for index, qty in pattern:
+            estimator.record_cut(
+                cut_lengths[index], qty * count, "cut length", stock_length, "new rebar"
+            )
+
+        excess_length = stock_length - sum(cut_lengths[index] * qty for index, qty in pattern)
+        if excess_length > 0:
+            estimator.excess_inventory[excess_length] += count
+            estimator.record_cut(excess_length, count, "excess", stock_length, "new rebar")
+
+
+def get_local_search_estimate(
+    cut_schedule: list,
+    wclengths: list = clengths_metric,
+    time_limit: float = 2.0,
+    seed: int = 0,
+    on_improvement=None,
+    report_interval: float = 0.2,
+) -> list:
+    """
+    Estimates rebars with the greedy engine, then improves the estimate by local
+    search until **time_limit** runs out or the total commercial length meets the
+    lower bound of `get_lower_bounds`. A valid best estimate is kept at all times,
+    and the result is never worse than `get_estimate` with or without fixed-point
+    lengths (see `get_greedy_estimate`).
+
+    Args:
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        wclengths (list): Commercial lengths to use.
+        time_limit (float): Time limit in seconds.
+        seed (int): Seed of the random moves.
+        on_improvement (callable): Called with the total commercial length and the
+            number of bars of the best solution, at most every **report_interval**
+            seconds while it improves.
+
+    Returns:
+        The same (estimate_result, excess_inventory, cut_record) as `get_estimate`.
+
+    """
+
+    deadline = time.monotonic() + time_limit
+    cut_schedule = list(cut_schedule)
+    cut_lengths, quantities, stock_lengths = prepare_cut_schedule(cut_schedule, wclengths)
+
+    greedy_result = get_greedy_estimate(cut_schedule, wclengths)
+    if not cut_lengths:
+        return greedy_result
+
+    greedy_steel = sum(length * qty for length, qty in greedy_result[0].items())
+    lower_bound = get_lower_bounds(cut_schedule, wclengths)["steel"]
+
+    search = LocalSearch(
+        get_greedy_bars(cut_lengths, quantities, stock_lengths),
+        cut_lengths,
+        stock_lengths,
+        seed,
+    )
+
+    # Stop early enough to turn the best solution back into an estimate in time
+    start = time.monotonic()
+    search.get_pattern_counts()
+    search_deadline = deadline - 2 * (time.monotonic() - start)
+
+    reported_steel = math.inf
+    next_report = time.monotonic()
+    while from_fixed_length(search.steel) > lower_bound:
+        # Check the clock only every few steps, each step is short
+        for _ in range(64):
+            search.step()
+        now = time.monotonic()
+        if on_improvement is not None and search.steel < reported_steel and now >= next_report:
+            on_improvement(from_fixed_length(search.steel), len(search.bars))
+            reported_steel = search.steel
+            next_report = now + report_interval
+        if now >= search_deadline:
+            break
+
+    if from_fixed_length(search.steel) >= round(greedy_steel, 3):
+        return greedy_result
+
+    estimator = Estimator(fixed_point=True)
+    record_bars(estimator, search.get_pattern_counts(), cut_lengths)
+    estimator.convert_from_fixed()
+    return estimator.estimate_result, estimator.excess_inventory, estimator.cut_record
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+import json
+import multiprocessing
+
+from rebarcalc import clengths_metric, get_estimate
+
+
+MAX_BODY_SIZE = 16 << 20
+"""Largest request body accepted, in bytes"""
+
+
+def parse_estimate_request(request: dict) -> dict:
+    """
+    Returns the normalized arguments of `get_estimate` from a JSON request body:
+    {"cut_schedule": [[cut_length, quantity], ...], "wclengths": [...], and optional
+    "fixed_point", "kerf" and "min_offcut"}. Raises **ValueError** if it is invalid,
+    including quantities that are not positive integers and cut lengths that are not
+    positive or longer than every commercial length.
+
+    """
+
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+
+    try:
+        cut_schedule = sorted(
+            (float(cut_length), _parse_quantity(quantity))
+            for cut_length, quantity in request["cut_schedule"]
+        )
+        wclengths = sorted(
+            float(clength) for clength in request.get("wclengths", clengths_metric)
+        )
+        options = {
+            "fixed_point": bool(request.get("fixed_point", False)),
+            "kerf": float(request.get("kerf", 0)),
+            "min_offcut": float(request.get("min_offcut", 0)),
+        }
+    except (KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Invalid estimate request: {error!r}") from error
+
+    if not cut_schedule or not wclengths:
+        raise ValueError("Cut schedule and commercial lengths must not be empty")
+    if wclengths[0] <= 0:
+        raise ValueError("Commercial lengths must be positive")
+    if not 0 < cut_schedule[0][0] or cut_schedule[-1][0] > wclengths[-1]:
+        raise ValueError(f"Cut lengths must be positive and at most {wclengths[-1]}")
+
+    return {"cut_schedule": cut_schedule, "wclengths": wclengths, **options}
+
+
+def _parse_quantity(quantity) -> int:
+    """Returns a JSON quantity as a positive int, accepting integral floats such as 2.0."""
+
+    if isinstance(quantity, float) and quantity.is_integer():
+        quantity = int(quantity)
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity <= 0:
+        raise ValueError(f"Quantity must be a positive integer: {quantity!r}")
+
+    return quantity
+
+
+def run_estimate(arguments: dict) -> dict:
+    """Runs `get_estimate` with normalized **arguments** and returns its result as JSON-ready lists."""
+
+    estimate_result, excess_inventory, cut_record = get_estimate(**arguments)
+    return {
+        "estimate_result": sorted(estimate_result.items()),
+        "excess_inventory": sorted(excess_inventory.items()),
+        "cut_record": list(cut_record),
+    }
+
+
+class EstimateService:
+    """
+    Local HTTP/JSON service wrapping `get_estimate`.
+
+    POST /estimate takes a body accepted by `parse_estimate_request` and returns the
+    result of `run_estimate`. Estimates run in **executor**, so the event loop keeps
+    serving while they are solved, and identical requests arriving while one is being
+    solved wait for that same computation instead of starting another.
+
+    Args:
+        workers (int): Number of worker processes if **executor** is not given.
+        executor (Executor): Pool to run estimates in.
+
+    Attributes:
+        computations (int): Number of estimates actually run.
+        coalesced (int): Number of requests answered by another request's computation.
+
+    """
+
+    def __init__(self, workers: int = None, executor=None):
+        if executor is None:
+            # Forked workers would inherit open client sockets and keep them from closing
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self.executor = executor
+        self.computations = 0
+        self.coalesced = 0
+        self._pending = {}
+        self._server = None
+
+    async def estimate(self, request: dict) -> dict:
+        """Returns the estimate of a request body, sharing the computation with identical pending requests."""
+
+        arguments = parse_estimate_request(request)
+        key = json.dumps(arguments, sort_keys=True)
+
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, run_estimate, arguments)
+        self._pending[key] = future
+        self.computations += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    async def handle_connection(self, reader, writer):
+        """Serves one HTTP request per connection."""
+
+        try:
+            status, response = await self._handle_request(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as error:
+            status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(error)}
+
+        body = json.dumps(response).encode()
+        writer.write(
+            (
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+            + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader) -> tuple:
+        """Returns the status and JSON response of the request read from **reader**."""
+
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if len(request_line) < 2:
+            return HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}
+
+        method, path = request_line[0], request_line[1]
+        if path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path != "/estimate":
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}
+
+        try:
+            size = int(headers.get("content-length", 0))
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}
+        if size > MAX_BODY_SIZE:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large"}
+
+        try:
+            request = json.loads(await reader.readexactly(size))
+            return HTTPStatus.OK, await self.estimate(request)
+        except ValueError as error:
+            # Also covers invalid JSON, which raises a subclass of ValueError
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        """Starts listening and returns the bound (host, port). Port **0** picks a free port."""
+
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stops listening and shuts the worker pool down."""
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve rebar estimates over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args()
+
+    async def serve():
+        service = EstimateService(workers=args.workers)
+        host, port = await service.start(args.host, args.port)
+        print(f"Serving estimates on http://{host}:{port}/estimate")
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from contextlib import contextmanager
+import math
+import sqlite3
+
+from rebarcalc import (
+    Estimator,
+    clengths_metric,
+    from_fixed_length,
+    to_fixed_length,
+    validate_cut_schedule,
+)
+
+
+class OffcutStore:
+    """
+    Offcut inventory kept between jobs in a local SQLite file.
+
+    Offcuts are stored as quantities per bar size and length, with lengths in integer
+    fixed-point units of **LENGTH_SCALE** so equal lengths always match. The primary
+    key on (bar_size, length) doubles as the index for range queries such as the
+    offcuts at least as long as a cut length.
+
+    Args:
+        path (str): SQLite database file, created if missing. **":memory:"** keeps
+            the store in memory only.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Transactions are started explicitly, see `transaction`
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS offcuts (
+                bar_size INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                quantity INTEGER NOT NULL CHECK (quantity > 0),
+                PRIMARY KEY (bar_size, length)
+            ) WITHOUT ROWID
+            """
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the enclosed reads and writes as one transaction, committed on success
+        and rolled back on error. The write lock is taken on entry, so concurrent
+        jobs on the same file cannot draw the same offcuts.
+
+        """
+
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def get_offcuts(
+        self, bar_size: int = 0, min_length: float = 0, max_length: float = math.inf
+    ) -> dict:
+        """Returns the quantity of each stored offcut length of **bar_size** in [min_length, max_length)."""
+
+        query = "SELECT length, quantity FROM offcuts WHERE bar_size = ? AND length >= ?"
+        params = [bar_size, to_fixed_length(min_length)]
+        if max_length != math.inf:
+            query += " AND length < ?"
+            params.append(to_fixed_length(max_length))
+
+        return {
+            from_fixed_length(length): quantity
+            for length, quantity in self.connection.execute(query, params)
+        }
+
+    def find_longest(
+        self, bar_size: int, min_length: float, max_length: float = math.inf
+    ):
+        """Returns the longest stored offcut length of **bar_size** in [min_length, max_length), or **None**."""
+
+        query = "SELECT MAX(length) FROM offcuts WHERE bar_size = ? AND length >= ?"
+        params = [bar_size, to_fixed_length(min_length)]
+        if max_length != math.inf:
+            query += " AND length < ?"
+            params.append(to_fixed_length(max_length))
+
+        (length,) = self.connection.execute(query, params).fetchone()
+        return None if length is None else from_fixed_length(length)
+
+    def add_offcuts(self, offcuts: dict, bar_size: int = 0):
+        """Adds the quantity of each offcut length in **offcuts**, removing lengths that reach zero."""
+
+        changes = [
+            (bar_size, to_fixed_length(length), int(qty))
+            for length, qty in offcuts.items()
+            if qty
+        ]
+        self.connection.executemany(
+            """
+            INSERT INTO offcuts (bar_size, length, quantity) VALUES (?, ?, ?)
+            ON CONFLICT (bar_size, length) DO UPDATE SET quantity = quantity + excluded.quantity
+            """,
+            [change for change in changes if change[2] > 0],
+        )
+
+        # Lengths used up are deleted before the others are reduced
+        removals = [
+            (-qty, bar_size, length) for bar_size, length, qty in changes if qty < 0
+        ]
+        self.connection.executemany(
+            "DELETE FROM offcuts WHERE quantity <= ? AND bar_size = ? AND length = ?",
+            removals,
+        )
+        self.connection.executemany(
+            "UPDATE offcuts SET quantity = quantity - ? WHERE bar_size = ? AND length = ?",
+            removals,
+        )
+
+    def count(self, bar_size: int = None) -> int:
+        """Returns the total quantity of stored offcuts, of one bar size if given."""
+
+        if bar_size is None:
+            query, params = "SELECT SUM(quantity) FROM offcuts", ()
+        else:
+            query, params = "SELECT SUM(quantity) FROM offcuts WHERE bar_size = ?", (bar_size,)
+
+        (total,) = self.connection.execute(query, params).fetchone()
+        return total or 0
+
+
+def get_stored_estimate(
+    cut_schedule: list,
+    store: OffcutStore,
+    bar_size: int = 0,
+    wclengths: list = clengths_metric,
+    **kwargs,
+) -> list:
+    """
+    Estimates rebars drawing on the offcuts of **store** before any new bar, then
+    writes the change to the stored offcuts back in the same transaction.
+
+    Only offcuts of **bar_size** at least as long as the shortest cut length are
+    read from the store. Used offcuts are removed and new excess lengths added, so
+    the next job sees what this one left in the yard.
+
+    Args:
+        cut_schedule (list): Iterable of (cut_length, quantity).
+        store (OffcutStore): Offcut inventory to draw from and write back to.
+        bar_size (int): Bar size of the schedule, **0** if sizes are not tracked.
+        wclengths (list): Commercial lengths to use.
+        **kwargs: Other arguments of `Estimator`, e.g. **kerf** and **min_offcut**.
+
+    Returns:
+        The same (estimate_result, excess_inventory, cut_record) as `get_estimate`.
+        **excess_inventory** holds every offcut of this bar size that fits a cut length
+        of the schedule, including those left unused.
+
+    """
+
+    cut_schedule = list(cut_schedule)
+    validate_cut_schedule(cut_schedule)
+    min_length = min((cut_length for cut_length, _ in cut_schedule), default=0)
+
+    with store.transaction():
+        offcuts = store.get_offcuts(bar_size, min_length)
+        result = Estimator(**kwargs).get_estimate(cut_schedule, wclengths, offcuts)
+
+        changes = dict(result[1])
+        for length, qty in offcuts.items():
+            changes[length] = changes.get(length, 0) - qty
+        store.add_offcuts(changes, bar_size)
+
+    return result
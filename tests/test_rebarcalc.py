@@ -1,4 +1,10 @@
 from rebarcalc import *
+from rebarcli import *
+import rebarcli
+import os
+import subprocess
+import sys
+
 import pytest
 
 
@@ -11,6 +17,13 @@ def test_get_optimal_clength():
     assert get_optimal_clength(cut_2, wclength) == 9.0
     assert get_optimal_clength(cut_3, wclength) == 6.0
 
+    # Only commercial lengths that fit the cut length are considered
+    assert get_optimal_clength(4.5, (3, 12)) == 12
+    with pytest.raises(ValueError):
+        get_optimal_clength(13.0, wclength)
+    with pytest.raises(ValueError):
+        get_optimal_clength(0, wclength)
+
 
 def test_estimate_clength():
     clength_1, reqd_qty_1, wclength_1 = 1.1, 16, 9.0
@@ -65,3 +78,357 @@ def test_get_estimate_2():
     assert output_2[1] == {0.2: 2, 2.4: 1}
     assert bool(output_2[2]) == True
 
+
+
+def test_get_estimate_3():
+    # Continue with shorter cut lengths once a cut length is fully produced from excess
+
+    sample_sched = {6: 1, 3: 1, 2: 1, 1: 5}
+    output = get_estimate(sample_sched.items(), (6.0,))
+
+    assert output[0] == {6.0: 3}
+    assert output[1] == {2.0: 1}
+
+
+def test_estimator():
+    # Separate estimators do not share state
+
+    estimator_1, estimator_2 = Estimator(), Estimator()
+    output_1 = estimator_1.get_estimate({1.1: 22}.items(), wclength)
+    output_2 = estimator_2.get_estimate({3: 36, 6: 22}.items(), wclength)
+
+    assert output_1[0] == {9.0: 3}
+    assert output_1[1] == {0.2: 2, 2.4: 1}
+    assert output_2[0] == {6.0: 40}
+    assert output_1[2] is not output_2[2]
+
+    estimator_1.reset()
+    assert not estimator_1.estimate_result and not estimator_1.cut_record
+
+
+def test_get_estimate_fixed_point():
+    # Fixed-point lengths give exact residues and excess inventory keys
+
+    assert to_fixed_length(1.1) == 1100
+    assert from_fixed_length(1100) == 1.1
+
+    output_1 = get_estimate({1.1: 22}.items(), wclength, fixed_point=True)
+    assert output_1[0] == {9.0: 3}
+    assert output_1[1] == {0.2: 2, 2.4: 1}
+
+    # 9.0 % 0.9 is slightly below 0.9 in floats, so only fixed-point sees 9.0 as exact
+    output_2 = get_estimate({0.9: 10}.items(), wclength, fixed_point=True)
+    assert output_2[0] == {9.0: 1}
+    assert output_2[1] == {}
+    assert output_2[2][0]["from_length"] == 9.0
+
+    # The exact residue of 9.0 is not always the better choice, so compare both
+    assert get_estimate([(1.8, 6)], wclength, fixed_point=True)[0] == {9.0: 2}
+    assert get_estimate([(1.8, 6)], wclength)[0] == {7.5: 2}
+    assert get_greedy_estimate([(1.8, 6)], wclength)[0] == {7.5: 2}
+    assert get_greedy_estimate({1.1: 22}.items(), wclength)[0] == {9.0: 3}
+
+
+def test_excess_inventory():
+    inventory = ExcessInventory({2.4: 1, 0.2: 2})
+    inventory[1.3] += 3
+
+    assert inventory == {0.2: 2, 1.3: 3, 2.4: 1}
+    assert inventory.lengths() == [0.2, 1.3, 2.4]
+    assert inventory.find_longest(1.0) == 2.4
+    assert inventory.find_longest(1.0, 2.4) == 1.3
+    assert inventory.find_longest(2.5) is None
+
+    inventory.pop(1.3)
+    assert inventory.lengths() == [0.2, 2.4]
+
+
+def test_use_excess_length_partial():
+    # Only the excess lengths actually cut are returned to the inventory
+
+    estimator = Estimator()
+    estimator.excess_inventory[3.0] = 10
+
+    assert estimator.use_excess_length(1.0, 4) == 0
+    assert estimator.excess_inventory == {3.0: 8, 2.0: 1}
+
+
+def test_cut_record():
+    log = CutRecord()
+    log.append(1.1, 22, "cut length", 9.0, "new rebar")
+    log.append(0.2, 2, "excess", 9.0, "new rebar")
+
+    assert len(log) == 2
+    assert log[1] == {
+        "produced_length": 0.2,
+        "produced_qty": 2,
+        "produced_type": "excess",
+        "from_length": 9.0,
+        "from_length_type": "new rebar",
+    }
+    assert [row["produced_qty"] for row in log] == [22, 2]
+
+    pd = pytest.importorskip("pandas")
+    df = log.to_pandas()
+    assert list(df.columns) == list(CutRecord.columns)
+    assert isinstance(df["produced_type"].dtype, pd.CategoricalDtype)
+    assert df["produced_type"].tolist() == ["cut length", "excess"]
+
+    # Appending while views are alive leaves the views unchanged
+    log.append(3.0, 1, "cut length", 9.0, "new rebar")
+    assert len(df) == 2 and len(log) == 3
+
+
+def test_get_optimal_clengths():
+    cut_lengths = [2.5, 1.1, 3.0]
+    optimal_clengths, yield_qtys, residues = get_optimal_clengths(cut_lengths, wclength)
+
+    assert optimal_clengths.tolist() == [
+        get_optimal_clength(cut_length, wclength) for cut_length in cut_lengths
+    ]
+    assert yield_qtys.tolist() == [3, 8, 2]
+    assert residues.tolist() == [0.0, 0.2, 0.0]
+
+    assert get_optimal_clengths([4.5, 1.1], (3, 12))[0].tolist() == [12, 3]
+    with pytest.raises(ValueError):
+        get_optimal_clengths([13.0], wclength)
+
+
+def test_get_estimates():
+    schedules = [{1.1: 22}.items(), {3: 36, 6: 22}.items(), {6: 1, 3: 1, 2: 1, 1: 5}.items()]
+    expected = [get_estimate(schedule, wclength) for schedule in schedules]
+
+    for workers in (1, 2):
+        outputs = get_estimates(schedules, wclength, workers=workers)
+        assert [output[0] for output in outputs] == [output[0] for output in expected]
+        assert [output[1] for output in outputs] == [output[1] for output in expected]
+        assert [list(output[2]) for output in outputs] == [list(output[2]) for output in expected]
+
+    indices = sorted(index for index, _ in iter_estimates(schedules, wclength, workers=2))
+    assert indices == [0, 1, 2]
+
+
+def test_read_cut_schedule(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    path = tmp_path / "schedule.csv"
+    path.write_text("cut_length,quantity\n1.1,10\n2.5,3\n1.1,6\n", encoding="utf-8-sig")
+    assert read_cut_schedule(str(path), block_size=32) == {1.1: 16.0, 2.5: 3.0}
+
+    invalid = tmp_path / "invalid.csv"
+    invalid.write_text("cut_length,quantity\n1.1,foo\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_cut_schedule(str(invalid))
+
+    extra = tmp_path / "extra.csv"
+    extra.write_text("bar_mark,quantity,cut_length\nA1,10,1.1\nB2,3,2.5\n", encoding="utf-8")
+    assert read_cut_schedule(str(extra)) == {1.1: 10.0, 2.5: 3.0}
+
+    missing = tmp_path / "missing.csv"
+    missing.write_text("bar_mark,cut_length\nA1,1.1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_cut_schedule(str(missing))
+
+
+def test_export_result(tmp_path, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    monkeypatch.chdir(tmp_path)
+    output = get_estimate({1.1: 22}.items(), wclength)
+
+    export_result(output, file_format="parquet")
+    estimates = pq.read_table("results/rebar_estimates.parquet")
+    assert estimates.to_pydict() == {"rebar_length": [9.0], "quantity": [3]}
+    assert pq.read_table("results/cut_log.parquet").num_rows == len(output[2])
+
+    export_result(output, file_format="arrow")
+    with pa.ipc.open_file("results/unused_excess.arrow") as reader:
+        excess = reader.read_all()
+    assert excess.to_pydict() == {"length": [0.2, 2.4], "quantity": [2, 1]}
+
+    with pytest.raises(ValueError):
+        export_result(output, file_format="xlsx")
+
+
+def test_estimator_stats():
+    collected = []
+    output = get_estimate({6: 1, 3: 1, 2: 1, 1: 5}.items(), (6.0,), on_stats=collected.append)
+
+    stats = collected[0]
+    assert stats.calls["use_excess_length"] == 4
+    assert stats.calls["get_optimal_clengths"] == 1
+    assert stats.records_written == len(output[2])
+    assert (stats.offcut_hits, stats.offcut_misses) == (2, 2)
+    assert stats.pieces_from_excess == 2
+    assert stats.inventory_high_water >= 1
+    assert stats.total_time >= sum(stats.times[phase] for phase in ("use_excess_length", "estimate_clength"))
+
+    # Instrumentation is off by default
+    assert Estimator().stats is None
+
+
+def test_get_estimate_kerf_min_offcut():
+    estimator = Estimator(min_offcut=0.3)
+    output = estimator.get_estimate([(5.8, 2), (4.0, 1)], (6.0, 12.0))
+    assert output[0] == {6.0: 2, 12.0: 1}
+    assert output[1] == {8.0: 1}
+    assert estimator.scrap_length == 0.4
+    assert [record["produced_type"] for record in output[2]].count("scrap") == 1
+
+    # Each piece but the last on a bar costs one kerf width
+    output = get_estimate([(3.0, 4)], (6.0,), kerf=0.01)
+    assert output[0] == {6.0: 4}
+    output = get_estimate([(2.99, 2)], (6.0,), kerf=0.02, fixed_point=True)
+    assert output[0] == {6.0: 1}
+    assert output[1] == {}
+
+
+def test_get_bar_size_estimates(tmp_path):
+    cut_schedule = [(16, 3.0, 4), (12, 1.1, 22), (16, 2.5, 2)]
+    estimates, weights, tonnage = get_bar_size_estimates(cut_schedule, wclength, workers=1)
+    assert list(estimates) == [12, 16]
+    assert estimates[12][0] == get_estimate([(1.1, 22)], wclength)[0]
+    assert estimates[16][0] == get_estimate([(3.0, 4), (2.5, 2)], wclength)[0]
+    assert weights[12] == round(get_unit_weight(12) * 27, 3)
+    assert tonnage == round(sum(weights.values()) / 1000, 3)
+
+    with pytest.raises(ValueError):
+        get_bar_size_estimates([(2, 10.0, 1)], clengths_english, "english", workers=1)
+
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "schedule.csv"
+    path.write_text("bar_size,cut_length,quantity\n12,1.1,10\n16,1.1,3\n12,1.1,6\n", encoding="utf-8")
+    assert read_bar_size_schedule(str(path)) == {(12, 1.1): 16.0, (16, 1.1): 3.0}
+
+
+def test_update_estimate():
+    def full_estimate(cut_schedule, **kwargs):
+        result = get_estimate(cut_schedule, wclength, **kwargs)
+        return dict(result[0]), dict(result[1]), list(result[2])
+
+    for kwargs in ({}, {"fixed_point": True, "kerf": 0.005, "min_offcut": 0.3}):
+        estimator = Estimator(**kwargs)
+        estimator.get_estimate([(5.2, 7), (3.3, 4)], wclength)
+
+        # Appending shorter cut lengths continues from the previous state
+        cut_schedule = [(5.2, 7), (3.3, 4), (1.1, 9), (0.7, 30)]
+        output = estimator.update_estimate(cut_schedule, wclength)
+        assert (dict(output[0]), dict(output[1]), list(output[2])) == full_estimate(cut_schedule, **kwargs)
+
+        # Any other change reruns the full estimate
+        cut_schedule = [(5.2, 7), (4.0, 2), (1.1, 9)]
+        output = estimator.update_estimate(cut_schedule, wclength)
+        assert (dict(output[0]), dict(output[1]), list(output[2])) == full_estimate(cut_schedule, **kwargs)
+
+    # Stats cover the last update only
+    estimator = Estimator(instrument=True)
+    estimator.get_estimate([(5.2, 7), (3.3, 4)], wclength)
+    estimator.update_estimate([(5.2, 7), (3.3, 4), (1.1, 9)], wclength)
+    assert estimator.stats.calls["estimate_clength"] == 1
+
+
+def test_run_batch(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+
+    for folder, cut_length in (("a", 1.1), ("b", 2.5)):
+        (tmp_path / "in" / folder).mkdir(parents=True)
+        path = tmp_path / "in" / folder / "schedule.csv"
+        path.write_text(f"cut_length,quantity\n{cut_length},10\n", encoding="utf-8")
+
+    output_dir = tmp_path / "out"
+    pattern = str(tmp_path / "in" / "**" / "*.csv")
+    assert run_batch([pattern, "-u", "metric", "-o", str(output_dir), "-w", "2"]) == 0
+    assert (output_dir / "a" / "schedule" / "rebar_estimates.csv").exists()
+    assert (output_dir / "b" / "schedule" / "cut_log.csv").exists()
+
+    # Failed files are reported without stopping the others
+    (tmp_path / "in" / "a" / "invalid.csv").write_text("cut_length,quantity\n1.1,foo\n", encoding="utf-8")
+    assert run_batch([pattern, "-l", "6", "12", "-o", str(output_dir), "-w", "1"]) == 1
+
+    # Cut lengths no commercial length can produce fail only their own file
+    (tmp_path / "in" / "a" / "invalid.csv").unlink()
+    (tmp_path / "in" / "a" / "long.csv").write_text("cut_length,quantity\n13,1\n", encoding="utf-8")
+    (tmp_path / "in" / "b" / "zero.csv").write_text("cut_length,quantity\n0,4\n", encoding="utf-8")
+    output_dir = tmp_path / "out_invalid"
+    for workers in ("1", "2"):
+        assert run_batch([pattern, "-u", "metric", "-o", str(output_dir), "-w", workers]) == 1
+        assert (output_dir / "b" / "schedule" / "rebar_estimates.csv").exists()
+    assert run_batch([str(tmp_path / "missing"), "-o", str(output_dir)]) == 1
+
+    # Unexpected errors are reported per file too
+    (tmp_path / "in" / "a" / "long.csv").unlink()
+    (tmp_path / "in" / "b" / "zero.csv").unlink()
+    (tmp_path / "in" / "a" / "schedule.csv").write_text("cut_length,quantity\n4.5,3\n", encoding="utf-8")
+    output_dir = tmp_path / "out_errors"
+    assert run_batch([pattern, "-l", "3", "12", "-o", str(output_dir), "-w", "1"]) == 0
+
+    def fail_on_long_cuts(cut_schedule, wclengths):
+        if max(cut_length for cut_length, _ in cut_schedule) > 4:
+            raise RuntimeError("failed")
+        return get_estimate(cut_schedule, wclengths)
+
+    monkeypatch.setattr(rebarcli, "get_estimate", fail_on_long_cuts)
+    assert run_batch([pattern, "-l", "3", "12", "-o", str(output_dir), "-w", "1"]) == 1
+    assert (output_dir / "b" / "schedule" / "rebar_estimates.csv").exists()
+
+
+def test_prepare_cut_schedule():
+    cut_lengths, quantities, stock_lengths = prepare_cut_schedule(
+        [(1.1, 10), (2.5, 0), (1.1, 6), (3, 2)], (9.0, 6.0)
+    )
+
+    assert cut_lengths == [3000, 1100]
+    assert quantities == [2, 16]
+    assert stock_lengths == [6000, 9000]
+
+    with pytest.raises(ValueError):
+        prepare_cut_schedule([(13.0, 1)], wclength)
+
+
+def test_get_lower_bounds():
+    # Two pieces over half the longest length never share a bar
+    assert get_lower_bounds([(7.0, 2), (4.0, 2)], (6.0, 7.5, 12.0)) == {"bars": 2, "steel": 22.0}
+    assert get_lower_bounds([(1.1, 22)], wclength)["bars"] == 3
+
+    output = get_estimate([(6.0, 3)], wclength)
+    gap = get_estimate_gap(output, [(6.0, 3)], wclength)
+    assert gap["optimal"] and gap["steel_gap"] == 0.0
+    assert gap["bars"] >= gap["bars_lower_bound"] == 2
+
+    with pytest.raises(ValueError):
+        get_lower_bounds([(13.0, 1)], wclength)
+
+
+def test_cut_record_aggregate():
+    log = CutRecord(aggregate=True)
+    log.append(1.1, 8, "cut length", 9.0, "new rebar")
+    log.append(0.2, 1, "excess", 9.0, "new rebar")
+    log.append(1.1, 8, "cut length", 9.0, "new rebar")
+    assert len(log) == 2
+    assert log[0]["produced_qty"] == 16
+
+    cut_schedule = [(2.5, 3), (2.4, 5), (1.1, 22), (0.3, 40)]
+    output = get_estimate(cut_schedule, wclength)
+    aggregated = get_estimate(cut_schedule, wclength, fixed_point=True, aggregate_log=True)
+    assert len(aggregated[2]) <= len(output[2])
+    assert sum(row["produced_qty"] for row in aggregated[2]) == sum(row["produced_qty"] for row in output[2])
+
+
+def test_import_time_budget():
+    # Importing the engine or the CLI loads no optional backend and no process pool
+    root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for module in ("rebarcalc", "rebarcli"):
+        code = (
+            f"import sys, time; start = time.perf_counter(); import {module}; "
+            "print(time.perf_counter() - start); print(' '.join(sys.modules))"
+        )
+        # The first run may compile the bytecode
+        for _ in range(2):
+            output = subprocess.run(
+                [sys.executable, "-c", code], cwd=root_path, capture_output=True, text=True, check=True
+            ).stdout.splitlines()
+
+        # Loose enough for a busy machine, the module check below is the strict one
+        assert float(output[0]) < 0.5
+        assert not set(output[1].split()) & {"numpy", "pandas", "pyarrow", "streamlit", "concurrent.futures"}
@@ -0,0 +1,128 @@
+from collections import defaultdict
+import random
+from rebarcalc import *
+import pytest
+
+
+pytest.importorskip("scipy")
+
+from rebaropt import *
+
+
+wclength = clengths_metric
+
+
+def total_length(lengths):
+    return round(sum(length * qty for length, qty in lengths.items()), 3)
+
+
+def test_get_exact_estimate():
+    sample_sched = {0.25: 10, 1.25: 10, 2.5: 2, 1.1: 96, 1.0: 70, 0.9: 24, 6: 32, 4.6: 68}
+    greedy = get_greedy_estimate(sample_sched.items(), wclength)
+    exact = get_exact_estimate(sample_sched.items(), wclength, time_limit=5)
+
+    # Every required cut is produced and the steel adds up
+    produced = defaultdict(int)
+    for row in exact[2]:
+        if row["produced_type"] == "cut length":
+            produced[row["produced_length"]] += row["produced_qty"]
+    assert produced == {length: qty for length, qty in sample_sched.items()}
+    assert total_length(exact[0]) == round(
+        total_length(sample_sched) + total_length(exact[1]), 3
+    )
+
+    assert total_length(exact[0]) <= total_length(greedy[0])
+
+    # Running out of time never leaves a worse estimate than greedy, with or without
+    # fixed-point lengths
+    rng = random.Random(0)
+    sample_sched = {round(rng.uniform(0.3, 6.0), 2): rng.randint(1, 100) for _ in range(200)}
+    greedy = get_greedy_estimate(sample_sched.items(), wclength)
+    for time_limit in (0.05, 0.5):
+        exact = get_exact_estimate(sample_sched.items(), wclength, time_limit=time_limit)
+        assert total_length(exact[0]) <= total_length(greedy[0])
+
+    # The first LP running out of time falls back to the greedy estimate
+    sample_sched = {round(rng.uniform(0.3, 5.9), 3): rng.randint(1, 40) for _ in range(3000)}
+    greedy = get_greedy_estimate(sample_sched.items(), wclength)
+    exact = get_exact_estimate(sample_sched.items(), wclength, time_limit=0, cache=None)
+    assert exact[0] == greedy[0]
+
+
+def test_enumerate_patterns():
+    patterns = enumerate_patterns([4, 3], [10])
+
+    assert sorted(patterns) == [(0, (0, 3)), (0, (1, 2)), (0, (2, 0))]
+    assert enumerate_patterns([4, 3], [10], max_patterns=2) is None
+    with pytest.raises(TimeoutError):
+        enumerate_patterns(list(range(100, 120)), [10000], deadline=0)
+
+
+def test_pattern_cache(tmp_path):
+    path = tmp_path / "patterns.json"
+    cache = PatternCache(maxsize=1, path=str(path))
+
+    patterns = cache.get_patterns([3, 4], [10])
+    assert sorted(patterns) == [(0, (0, 2)), (0, (2, 1)), (0, (3, 0))]
+    assert cache.get_patterns([4, 3], [10]) == enumerate_patterns([4, 3], [10])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get_patterns([5], [10])
+    assert len(cache) == 1
+
+    cache.save()
+    assert PatternCache(path=str(path)).get_patterns([5], [10]) == [(0, (2,))]
+
+    # Too many cut lengths, or no time left, skip enumeration without caching
+    cache = PatternCache(max_cut_lengths=2)
+    assert cache.get_patterns([5, 4, 3], [10]) is None
+    assert len(cache) == 0 and cache.misses == 0
+    cache = PatternCache(max_patterns=10**9)
+    assert cache.get_patterns(list(range(100, 112)), [10000], deadline=0) is None
+    assert len(cache) == 0
+
+
+def test_get_cost_estimate():
+    sample_sched = [(4.0, 5), (4.0, 4)]
+    prices = {6.0: 10, 12.0: 15}
+
+    # Long bars are cheaper per meter, so they are preferred while available
+    result = get_cost_estimate(sample_sched, (6.0, 12.0), prices, time_limit=5)
+    assert result[0] == {12.0: 3}
+    assert get_estimate_cost(result, prices) == 45
+
+    result = get_cost_estimate(
+        sample_sched, (6.0, 12.0), prices, {12.0: 2}, cut_cost=1, time_limit=5
+    )
+    assert result[0] == {12.0: 2, 6.0: 3}
+    assert get_estimate_cost(result, prices, cut_cost=1) == 69
+
+    with pytest.raises(ValueError):
+        get_cost_estimate(sample_sched, (6.0, 12.0), prices, {12.0: 0, 6.0: 5})
+
+
+def test_get_cost_estimate_time_limit():
+    rng = random.Random(0)
+    sample_sched = {round(rng.uniform(0.3, 5.9), 2): rng.randint(1, 40) for _ in range(150)}
+
+    # Running out of time still respects the available bars
+    for time_limit in (0, 0.05, 2):
+        result = get_cost_estimate(
+            sample_sched.items(), wclength, {12: 10}, {12: 5}, time_limit=time_limit
+        )
+        assert result[0][12.0] <= 5
+
+        produced = defaultdict(int)
+        for row in result[2]:
+            if row["produced_type"] == "cut length":
+                produced[row["produced_length"]] += row["produced_qty"]
+        assert produced == sample_sched
+
+    # The bars packed for a shortfall stay within the bars left
+    pattern_counts = pack_shortfall(
+        [(5000, 3), (4000, 2), (1000, 7)], [5000, 4000, 1000], [6000, 12000], [None, 1]
+    )
+    assert sum(count for (stock_index, _), count in pattern_counts.items() if stock_index == 1) <= 1
+    assert get_shortfall(pattern_counts, [5000, 4000, 1000], [3, 2, 7]) == []
+    with pytest.raises(ValueError):
+        pack_shortfall([(5000, 3)], [5000], [6000, 12000], [2, 0])
@@ -0,0 +1,48 @@
+from collections import defaultdict
+from rebarcalc import *
+from rebarpack import *
+
+
+wclength = clengths_metric
+
+
+def test_capacity_tree():
+    tree = CapacityTree(12)
+    tree.add(5)
+    tree.add(9, 2)
+
+    assert tree.find_at_least(3) == 5
+    assert tree.find_at_least(6) == 9
+    assert tree.find_at_least(10) is None
+
+    tree.add(5, -1)
+    assert tree.find_at_least(3) == 9
+
+
+def test_pack_best_fit():
+    # Different cut lengths share the tightest open bar
+    bars = pack_best_fit([7, 4, 1], [1, 2, 3], 12)
+
+    assert [len(pieces) for _, _, pieces in bars] == [3, 3]
+    assert all(
+        sum((7, 4, 1)[index] for index in pieces) <= length for length, _, pieces in bars
+    )
+
+
+def test_get_best_fit_estimate():
+    sample_sched = {6: 2, 4.5: 2, 1.5: 2}
+    output = get_best_fit_estimate(sample_sched.items(), wclength)
+
+    assert output[0] == {12.0: 2}
+    assert output[1] == {}
+
+    produced = defaultdict(int)
+    for row in output[2]:
+        if row["produced_type"] == "cut length":
+            produced[row["produced_length"]] += row["produced_qty"]
+    assert produced == {6.0: 2, 4.5: 2, 1.5: 2}
+
+    # Available excess lengths are cut before new rebars
+    output = get_best_fit_estimate({4.5: 1}.items(), wclength, excess_inventory={5.0: 1})
+    assert output[0] == {}
+    assert output[1] == {0.5: 1}
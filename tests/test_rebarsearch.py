@@ -0,0 +1,65 @@
+from collections import defaultdict
+import random
+import time
+from rebarcalc import *
+from rebarsearch import *
+
+
+wclength = clengths_metric
+
+
+def test_get_greedy_bars():
+    bars = get_greedy_bars([3000, 1100], [5, 22], [6000, 9000, 12000])
+
+    assert [sum((3000, 1100)[index] for index in pieces) for _, _, pieces in bars] == [
+        used for _, used, _ in bars
+    ]
+    assert sum(len(pieces) for _, _, pieces in bars) == 27
+    assert all(used <= stock for stock, used, _ in bars)
+
+
+def test_get_local_search_estimate():
+    sample_sched = {5.2: 7, 3.3: 4, 1.1: 9, 0.7: 30}
+    greedy = get_estimate(sample_sched.items(), wclength)
+    improved = []
+    output = get_local_search_estimate(
+        sample_sched.items(), wclength, time_limit=0.5, on_improvement=lambda *args: improved.append(args)
+    )
+
+    def steel(result):
+        return sum(length * qty for length, qty in result[0].items())
+
+    assert steel(output) <= steel(greedy)
+    assert improved
+
+    produced = defaultdict(int)
+    for row in output[2]:
+        if row["produced_type"] == "cut length":
+            produced[row["produced_length"]] += row["produced_qty"]
+    assert produced == sample_sched
+
+    # Searching stops at once when the greedy estimate meets the lower bound
+    output = get_local_search_estimate({6: 4}.items(), wclength, time_limit=5)
+    assert output[0] == {6.0: 4}
+
+    # Floating point greedy is better than fixed-point here, and is not lost
+    output = get_local_search_estimate([(1.8, 6)], wclength, time_limit=0)
+    assert steel(output) <= steel(get_estimate([(1.8, 6)], wclength))
+
+
+def test_get_local_search_estimate_time_limit():
+    rng = random.Random(0)
+    sample_sched = {round(0.3 + 0.05 * step, 3): rng.randint(100, 400) for step in range(115)}
+
+    start = time.monotonic()
+    output = get_local_search_estimate(sample_sched.items(), wclength, time_limit=1.0)
+    elapsed = time.monotonic() - start
+
+    # Converting the best solution back into an estimate counts against the limit.
+    # The bound is loose so a busy machine does not fail it, an unbounded search
+    # or conversion still does
+    assert elapsed < 2.0
+    produced = sum(
+        row["produced_qty"] for row in output[2] if row["produced_type"] == "cut length"
+    )
+    assert produced == sum(sample_sched.values())
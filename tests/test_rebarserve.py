@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+from rebarcalc import *
+from rebarserve import *
+
+
+wclength = clengths_metric
+
+
+async def post(host: str, port: int, path: str, body: bytes) -> tuple:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_estimate_service():
+    async def run():
+        service = EstimateService(executor=ThreadPoolExecutor(max_workers=2))
+        host, port = await service.start(port=0)
+        try:
+            request = {"cut_schedule": [[1.1, 22], [2.5, 3]], "wclengths": list(wclength)}
+            status, response = await post(host, port, "/estimate", json.dumps(request).encode())
+            assert status == 200
+            expected = get_estimate([(1.1, 22), (2.5, 3)], wclength)
+            assert response["estimate_result"] == [list(item) for item in sorted(expected[0].items())]
+            assert len(response["cut_record"]) == len(expected[2])
+
+            # Identical concurrent requests share one computation
+            computations = service.computations
+            responses = await asyncio.gather(*(service.estimate(request) for _ in range(5)))
+            assert service.computations == computations + 1
+            assert service.coalesced == 4
+            assert all(item == responses[0] for item in responses)
+
+            status, response = await post(host, port, "/estimate", b"{\"cut_schedule\": 1}")
+            assert status == 400
+            for cut_schedule in ([[0, 2]], [[13.0, 1]], [[1.1, -3]], [[1.1, 2.5]], [[1.1, "2"]]):
+                body = json.dumps({"cut_schedule": cut_schedule}).encode()
+                status, response = await post(host, port, "/estimate", body)
+                assert status == 400 and "error" in response
+
+            # Quantities stay integers in the response
+            request = {"cut_schedule": [[2.4, 2.0], [1.1, 3]]}
+            status, response = await post(host, port, "/estimate", json.dumps(request).encode())
+            assert status == 200
+            assert all(isinstance(qty, int) for _, qty in response["excess_inventory"])
+            status, _ = await post(host, port, "/other", b"")
+            assert status == 404
+        finally:
+            await service.close()
+
+    asyncio.run(run())
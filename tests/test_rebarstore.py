@@ -0,0 +1,55 @@
+from rebarcalc import *
+import pytest
+from rebarstore import *
+
+
+wclength = clengths_metric
+
+
+def test_offcut_store():
+    with OffcutStore(":memory:") as store:
+        store.add_offcuts({2.4: 3, 5.5: 1, 0.8: 2}, bar_size=12)
+        store.add_offcuts({5.5: 4}, bar_size=16)
+
+        assert store.get_offcuts(12, min_length=1.0) == {2.4: 3, 5.5: 1}
+        assert store.find_longest(12, 1.0, 5.5) == 2.4
+        assert store.find_longest(16, 6.0) is None
+        assert store.count() == 10
+
+        store.add_offcuts({0.8: -2}, bar_size=12)
+        assert store.get_offcuts(12) == {2.4: 3, 5.5: 1}
+
+
+def test_get_stored_estimate(tmp_path, monkeypatch):
+    path = str(tmp_path / "yard.sqlite")
+    with OffcutStore(path) as store:
+        store.add_offcuts({2.4: 3, 0.5: 1}, bar_size=12)
+
+    # Offcuts are used before new bars and the remainders are written back
+    with OffcutStore(path) as store:
+        output = get_stored_estimate([(1.1, 8)], store, 12, wclength)
+        assert output[0] == get_estimate([(1.1, 2)], wclength)[0]
+        assert store.get_offcuts(12) == {0.2: 3, 0.5: 1, **get_estimate([(1.1, 2)], wclength)[1]}
+
+    # Failures inside the transaction leave the store unchanged
+    def fail(*args, **kwargs):
+        raise RuntimeError("failed")
+
+    def add_offcuts_then_fail(self, *args, **kwargs):
+        add_offcuts(self, *args, **kwargs)
+        fail()
+
+    add_offcuts = OffcutStore.add_offcuts
+    with OffcutStore(path) as store:
+        before = store.get_offcuts(12)
+        with monkeypatch.context() as patch:
+            patch.setattr(Estimator, "get_estimate", fail)
+            with pytest.raises(RuntimeError):
+                get_stored_estimate([(1.1, 8)], store, 12, wclength)
+        assert store.get_offcuts(12) == before
+
+        with monkeypatch.context() as patch:
+            patch.setattr(OffcutStore, "add_offcuts", add_offcuts_then_fail)
+            with pytest.raises(RuntimeError):
+                get_stored_estimate([(1.1, 8)], store, 12, wclength)
+        assert store.get_offcuts(12) == before